@@ -5,27 +5,38 @@ from engine.scripting.lua_bridge import LuaBridge
 class ScriptBridge:
     def __init__(self):
         self.plugins = []
+        self._on_update_callbacks = []
         self.js_plugins = []
         self.lua_bridge = LuaBridge()
 
     def load_python_plugins(self, path="./plugins"):
-        if not os.path.exists(path):
-            os.makedirs(path)
+        os.makedirs(path, exist_ok=True)
         print(f"NeoPyxel: Loading Python Plugins from {path}")
+        self._rebuild_callbacks()
+
+    def add_plugin(self, plugin):
+        self.plugins.append(plugin)
+        self._rebuild_callbacks()
+
+    def remove_plugin(self, plugin):
+        self.plugins.remove(plugin)
+        self._rebuild_callbacks()
+
+    def _rebuild_callbacks(self):
+        """Resolve plugin hooks once so the per-tick loop skips hasattr lookups."""
+        self._on_update_callbacks = [p.on_update for p in self.plugins if hasattr(p, 'on_update')]
 
     def load_lua_plugins(self, path="./plugins/lua"):
-        if not os.path.exists(path):
-            os.makedirs(path)
-        for filename in os.listdir(path):
-            if filename.endswith(".lua"):
-                filepath = os.path.join(path, filename)
-                self.lua_bridge.load_script(filepath)
-                print(f"NeoPyxel: Loaded Lua plugin: {filename}")
+        os.makedirs(path, exist_ok=True)
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".lua") and entry.is_file():
+                    self.lua_bridge.load_script(entry.path)
+                    print(f"NeoPyxel: Loaded Lua plugin: {entry.name}")
 
     def update_plugins(self, entity_id):
-        for plugin in self.plugins:
-            if hasattr(plugin, 'on_update'):
-                plugin.on_update(entity_id)
+        for callback in self._on_update_callbacks:
+            callback(entity_id)
         self.lua_bridge.call_function('on_update', entity_id)       
 
     def execute_js_logic(self, js_code):
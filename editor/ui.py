@@ -1,16 +1,49 @@
+from collections import OrderedDict
+
 import pygame
+import pygame.freetype
+
+TEXT_CACHE_SIZE = 128
 
 class EditorUI:
     def __init__(self, font_size=24):
-        pygame.font.init()
-        self.font = pygame.font.SysFont("NotoSans", font_size)
+        pygame.freetype.init()
+        self.font = pygame.freetype.SysFont("NotoSans", font_size)
         self.ui_color = (255, 255, 255)
+        self._text_cache = OrderedDict()  # (text, color) -> (Surface, x offset, y offset)
+        self._last_info = {}  # status key -> (value, color, cache entry) drawn last frame
+
+    def _render_text(self, text, color):
+        """Return (surface, x offset, y offset), reusing it while the text is unchanged.
+
+        freetype crops the surface to the glyphs' bounding box; the offsets place it
+        so the given position is still the line's top-left, as with pygame.font.
+        """
+        key = (text, color)
+        entry = self._text_cache.get(key)
+        if entry is not None:
+            self._text_cache.move_to_end(key)
+            return entry
+        surf, bounds = self.font.render(text, color)
+        entry = (surf, bounds.x, self.font.get_sized_ascender() - bounds.y)
+        self._text_cache[key] = entry
+        if len(self._text_cache) > TEXT_CACHE_SIZE:
+            self._text_cache.popitem(last=False)
+        return entry
 
     def draw_status(self, backend, clock, info_dict):
         y_offset = 10
         info_dict["FPS"] = int(clock.get_fps())
         for key, value in info_dict.items():
-            backend.draw_text(f"{key}: {value}", (10, y_offset), self.ui_color, self.font)
+            # Cached surfaces keep their identity, so GPU backends reuse the uploaded texture too.
+            last = self._last_info.get(key)
+            if last is not None and last[0] == value and last[1] == self.ui_color:
+                entry = last[2]
+            else:
+                entry = self._render_text(f"{key}: {value}", self.ui_color)
+                self._last_info[key] = (value, self.ui_color, entry)
+            surf, x, y = entry
+            backend.draw_surface(surf, pygame.Rect(10 + x, y_offset + y, surf.get_width(), surf.get_height()))
             y_offset += 25
 
     def draw_cursor_info(self, backend, pos):
@@ -1,26 +1,182 @@
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; motion falls back to a numpy add
+    njit = None
+
+INITIAL_CAPACITY = 256
+SOLID_SURFACE_CACHE_SIZE = 256
+
+_solid_surfaces = OrderedDict()  # (width, height, color) -> shared Surface
+
+def solid_surface(width, height, color):
+    """Return the flat-colored image used by rect entities, shared per size and color.
+
+    Entity images are never drawn into, so every entity with the same rect size
+    and color can use one surface (and one GPU texture).
+    """
+    key = (width, height, tuple(color))
+    surface = _solid_surfaces.get(key)
+    if surface is not None:
+        _solid_surfaces.move_to_end(key)
+        return surface
+    surface = pygame.Surface((width, height))
+    surface.fill(color)
+    _solid_surfaces[key] = surface
+    if len(_solid_surfaces) > SOLID_SURFACE_CACHE_SIZE:
+        _solid_surfaces.popitem(last=False)
+    return surface
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _integrate(pos, vel, n):
+        for i in prange(n):
+            pos[i, 0] += vel[i, 0]
+            pos[i, 1] += vel[i, 1]
+else:
+    def _integrate(pos, vel, n):
+        pos[:n] += vel[:n]
+
 class Entity:
-    def __init__(self, x, y, width, height, color=(0, 255, 0)):
+    __slots__ = ("rect", "color", "image", "sprite_path")
+
+    def __init__(self, x, y, width, height, color=(0, 255, 0), image=None):
         self.rect = pygame.Rect(x, y, width, height)
         self.color = color
-        self.image = pygame.Surface((width, height))
-        self.image.fill(self.color)
-
-    def update(self):
-        pass
+        self.image = image if image is not None else solid_surface(width, height, color)
+        self.sprite_path = None
 
 class EntityManager:
-    def __init__(self):
+    """Entity objects plus structure-of-arrays copies of their rects and colors.
+
+    Row i of pos/size/color/vel mirrors entities[i]. Add, remove and edit entities
+    through the manager so both views stay in sync.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
         self.entities = []
+        self.pos = np.zeros((capacity, 2), dtype=np.int32)
+        self.size = np.zeros((capacity, 2), dtype=np.int32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.vel = np.zeros((capacity, 2), dtype=np.int32)  # pixels per update
 
-    def add_entity(self, x, y, color=(0, 255, 0)):
-        new_entity = Entity(x, y, 16, 16, color)
-        self.entities.append(new_entity)
+    def _reserve(self, count):
+        capacity = len(self.pos)
+        if count <= capacity:
+            return
+        while capacity < count:
+            capacity *= 2
+        n = len(self.entities)
+        for name in ("pos", "size", "color", "vel"):
+            old = getattr(self, name)
+            grown = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            grown[:n] = old[:n]
+            setattr(self, name, grown)
+
+    def _write_row(self, index, entity):
+        rect = entity.rect
+        self.pos[index] = (rect.x, rect.y)
+        self.size[index] = (rect.width, rect.height)
+        self.color[index] = entity.color[:3]
+
+    def add_entity(self, x, y, color=(0, 255, 0), width=16, height=16, image=None):
+        entity = Entity(x, y, width, height, color, image)
+        index = len(self.entities)
+        self._reserve(index + 1)
+        self.entities.append(entity)
+        self._write_row(index, entity)
+        self.vel[index] = 0
+        return entity
+
+    def add_entities(self, xs, ys, color=(0, 255, 0), width=16, height=16):
+        """Add one solid entity per (x, y) pair, writing their rows in one go; returns them in order."""
+        xs = np.asarray(xs, dtype=np.int32)
+        ys = np.asarray(ys, dtype=np.int32)
+        start = len(self.entities)
+        end = start + len(xs)
+        self._reserve(end)
+        image = solid_surface(width, height, color)
+        added = [Entity(x, y, width, height, color, image) for x, y in zip(xs.tolist(), ys.tolist())]
+        self.entities.extend(added)
+        self.pos[start:end, 0] = xs
+        self.pos[start:end, 1] = ys
+        self.size[start:end] = (width, height)
+        self.color[start:end] = color[:3]
+        self.vel[start:end] = 0
+        return added
+
+    def update_entity(self, index, x, y, width, height, color, image=None):
+        """Move/resize/recolor an entity; without an image, a solid one is rebuilt."""
+        entity = self.entities[index]
+        entity.rect.update(x, y, width, height)
+        entity.color = color
+        entity.image = image if image is not None else solid_surface(width, height, color)
+        self._write_row(index, entity)
+        return entity
+
+    def remove_at(self, index):
+        entity = self.entities.pop(index)
+        n = len(self.entities)
+        for arr in (self.pos, self.size, self.color, self.vel):
+            arr[index:n] = arr[index + 1:n + 1]
+        return entity
+
+    def remove_entity(self, entity):
+        for index, candidate in enumerate(self.entities):
+            if candidate is entity:
+                self.remove_at(index)
+                return True
+        return False
+
+    def remove_entities(self, entities):
+        """Remove several entities with one compaction pass; returns how many were found."""
+        doomed = {id(entity) for entity in entities}
+        n = len(self.entities)
+        keep = np.fromiter((id(entity) not in doomed for entity in self.entities), dtype=bool, count=n)
+        kept = int(keep.sum())
+        if kept == n:
+            return 0
+        for arr in (self.pos, self.size, self.color, self.vel):
+            arr[:kept] = arr[:n][keep]
+        self.entities[:] = [entity for entity, alive in zip(self.entities, keep.tolist()) if alive]
+        return n - kept
+
+    def clear(self):
+        self.entities.clear()
+
+    def set_velocity(self, index, vx, vy):
+        self.vel[index] = (vx, vy)
 
     def update_all(self):
-        for entity in self.entities:
-            entity.update()
+        """Advance every entity by its velocity and sync the rects that moved; True if any did."""
+        n = len(self.entities)
+        moving = np.flatnonzero(self.vel[:n].any(axis=1))
+        if not len(moving):
+            return False
+        _integrate(self.pos, self.vel, n)
+        for i, (x, y) in zip(moving.tolist(), self.pos[moving].tolist()):
+            self.entities[i].rect.topleft = (x, y)
+        return True
+
+    def visible_blits(self, area):
+        """(image, rect) of every entity overlapping area, in draw order; culled on the arrays."""
+        n = len(self.entities)
+        pos = self.pos[:n]
+        far = pos + self.size[:n]
+        hits = (pos[:, 0] < area.right) & (far[:, 0] > area.left) & (pos[:, 1] < area.bottom) & (far[:, 1] > area.top)
+        entities = self.entities
+        if hits.all():
+            return [(entity.image, entity.rect) for entity in entities]
+        return [(entities[i].image, entities[i].rect) for i in np.flatnonzero(hits).tolist()]
+
+    def centers(self):
+        """Rect centres of every entity as an (n, 2) array, rounded like Rect.center."""
+        n = len(self.entities)
+        return self.pos[:n] + self.size[:n] // 2
 
     def get_all(self):
         return self.entities
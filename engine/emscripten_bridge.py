@@ -23,5 +23,8 @@ class EmscriptenBridge:
     
     def get_entities(self):
         """Return entity data for JS rendering."""
-        return [{'x': e.rect.x, 'y': e.rect.y, 'color': e.color} 
-                for e in self.world.entities]
\ No newline at end of file
+        world = self.world
+        n = len(world.entities)
+        # Raw SoA rows: pos/size are int32 pairs, color is uint8 RGB.
+        return {'pos': world.pos[:n].tobytes(), 'size': world.size[:n].tobytes(),
+                'color': world.color[:n].tobytes(), 'n': n}
\ No newline at end of file
@@ -15,6 +15,27 @@ class GraphicsBackend(ABC):
         """Prepare for a new frame (clear buffers, etc.)."""
         pass
 
+    def mark_dirty(self, rect):
+        """Hint that only this region changes next frame; backends may ignore it."""
+        pass
+
+    def frame_clip(self):
+        """Region the frame since begin_frame is limited to, or None when it redraws everything."""
+        return None
+
+    def invalidate_surface(self, surface):
+        """Notify the backend that a surface's pixels changed after it was drawn."""
+        pass
+
+    def prepare_surface(self, surface):
+        """Return a copy of a freshly loaded surface in the pixel format this backend draws fastest."""
+        display_ready = pygame.display.get_init() and pygame.display.get_surface() is not None
+        if not display_ready:
+            return surface
+        if surface.get_alpha() is not None:
+            return surface.convert_alpha()
+        return surface.convert()
+
     @abstractmethod
     def draw_rect(self, rect, color):
         """Draw a filled rectangle at the given pygame.Rect (in internal coordinates)."""
@@ -25,11 +46,21 @@ class GraphicsBackend(ABC):
         """Draw a pygame Surface (for sprites) at the given rect."""
         pass
 
+    def draw_surfaces(self, blits):
+        """Draw a sequence of (surface, rect) pairs in order."""
+        draw_surface = self.draw_surface
+        for surface, rect in blits:
+            draw_surface(surface, rect)
+
     @abstractmethod
     def apply_lighting(self, light_mask):
         """Apply the light mask (pygame Surface with per-pixel alpha) to the frame."""
         pass
 
+    def apply_lights(self, lighting):
+        """Apply a DynamicLighting; backends without a GPU light path use its mask."""
+        self.apply_lighting(lighting.get_mask())
+
     @abstractmethod
     def draw_text(self, text, position, color, font):
         """Draw text using a pygame Font (or backend equivalent)."""
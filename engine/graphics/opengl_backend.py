@@ -1,9 +1,75 @@
 # engine/graphics/opengl_backend.py
+import weakref
+from collections import OrderedDict
+
+import math
 import pygame
+import pygame.freetype
 import moderngl
 import numpy as np
 from .backend import GraphicsBackend
 
+MAX_SPRITES = 4096
+# Per-sprite instance record, uploaded as-is: rect (x, y, w, h), uv rect (u0, v0, u1, v1),
+# color, and the GL name of the texture used to split the batch into draw calls.
+INSTANCE_DTYPE = np.dtype([('rect', '4f4'), ('uv', '4f4'), ('color', '4f4'), ('tex', 'i4')])
+INSTANCE_BYTES = INSTANCE_DTYPE.itemsize
+TEXTURE_CACHE_SIZE = 256
+# One oversized triangle generated from gl_VertexID: no vertex buffer, no diagonal seam
+FULLSCREEN_VERTEX_SHADER = '''
+    #version 330
+    out vec2 uv;
+    void main() {
+        uv = vec2((gl_VertexID << 1) & 2, gl_VertexID & 2);
+        gl_Position = vec4(uv * 2.0 - 1.0, 0.0, 1.0);
+    }
+'''
+MAX_LIGHTS = 256
+LIGHT_BYTES = 8 * 4  # vec4 (x, y, radius, 0) + vec4 (r, g, b, 0), std140
+DOF_FOCAL_DISTANCE = 0.5
+DOF_FOCAL_RANGE = 0.3
+DOF_KERNEL_RADIUS = 4  # texels each side of the centre; 9 taps fetched as 5 linear samples
+GLYPH_ATLAS_SIZE = 1024
+GLYPH_PADDING = 1  # empty texels between glyphs so linear filtering never bleeds
+WHITE = (1.0, 1.0, 1.0, 1.0)
+SOLID_UV = (0.5 / GLYPH_ATLAS_SIZE,) * 4  # centre of the opaque texel at the atlas origin
+TEXT_SURFACE_CACHE_SIZE = 32
+UPLOAD_RING_SIZE = 3  # staging buffers cycled so a new upload never waits on the previous one
+
+def _dof_fragment_shader(direction, radius=DOF_KERNEL_RADIUS):
+    """Generate one DOF blur pass with its Gaussian taps unrolled and the weights baked in.
+
+    Weights come from the binomial row 2 * radius + 4 without its two outer
+    terms on each side; neighbouring taps are merged into one linear fetch.
+    """
+    row = [math.comb(2 * radius + 4, k) for k in range(2, 2 * radius + 3)]
+    total = float(sum(row))
+    weights = [w / total for w in row[radius:]] + [0.0]  # centre outwards, padded for an odd radius
+    fetches = ['vec4 col = texture(colorTex, uv) * %.10f;' % weights[0]]
+    for i in range(1, radius + 1, 2):
+        pair = weights[i] + weights[i + 1]
+        offset = (i * weights[i] + (i + 1) * weights[i + 1]) / pair
+        for sign in '+-':
+            fetches.append('col += texture(colorTex, uv %s step * %.10f) * %.10f;' % (sign, offset, pair))
+    return '''
+        #version 330
+        uniform sampler2D colorTex;
+        uniform sampler2D depthTex;
+        layout(std140) uniform DepthOfField {
+            float focalDistance;
+            float focalRange;
+        };
+        in vec2 uv;
+        out vec4 f_color;
+        void main() {
+            float depth = texture(depthTex, uv).r;
+            float blurAmount = smoothstep(0.0, focalRange, abs(depth - focalDistance));
+            vec2 step = vec2(%s) / vec2(textureSize(colorTex, 0)) * blurAmount;
+            %s
+            f_color = col;
+        }
+    ''' % (direction, '\n            '.join(fetches))
+
 class OpenGLBackend(GraphicsBackend):
     def __init__(self):
         self.ctx = None
@@ -19,15 +85,61 @@ class OpenGLBackend(GraphicsBackend):
         self.bloom_fbo = None
         self.bloom_texture = None
         self.sprite_shader = None
-        self.text_shader = None
-        self.dof_shader = None
+        self.dof_h_shader = None
+        self.dof_v_shader = None
+        self.dof_h_vao = None
+        self.dof_v_vao = None
+        self.dof_ubo = None
+        self.dof_enabled = False
+        self.lighting_shader = None
+        self.lighting_vao = None
+        self.point_light_shader = None
+        self.point_light_vao = None
+        self.light_ubo = None
+        self._uploaded_lights = []  # light list currently in light_ubo
+        self.light_tex = None
+        self._upload_ring = []
+        self._upload_index = 0
         self.quad_vao = None
-        self.sprite_batch = []  # Temporary batching list
-        self.projection_matrix = None
+        self.sprite_quad_vbo = None
+        self.instance_vbo = None
+        self.sprite_vao = None
+        self._instances = np.zeros(MAX_SPRITES, dtype=INSTANCE_DTYPE)  # flushed in submission order
+        self._batch_n = 0
+        self._batch_textures = {}  # GL name -> texture queued since the last flush
+        self._instance_attribs = []
+        self._bound_first = 0  # instance the per-instance attributes currently start at
+        self._dirty = []  # internal-res rects changed since the last frame
+        self._scissor = None  # GL scissor box for the current frame, None for a full redraw
+        self._clip = None  # the same region in internal coordinates
+        self._full_redraw = True
+        self._texture_cache = OrderedDict()  # id(surface) -> (weakref, texture, finalizer)
+        self._freed_surfaces = []  # cache keys whose surfaces were garbage collected
+        self.glyph_atlas = None  # one texture shared by every font, filled on demand
+        self._glyphs = {}  # (font key, char) -> (u0, v0, u1, v1, width, height, x_offset, advance)
+        self._glyph_generation = 0  # bumped whenever the atlas is wiped, invalidating looked-up glyphs
+        self._shelf = [0, 0, 0]  # packer cursor: x, y, current row height
+        self._text_surfaces = OrderedDict()  # (font key, text, color) -> (surface, x offset, y offset)
 
     def initialize(self, internal_res, screen_res, title="NeoPyxel"):
+        if self.ctx is not None and screen_res == self.screen_res:
+            # Same window: keep the context, programs and buffers; only the
+            # framebuffers depend on the internal resolution.
+            if internal_res != self.internal_res:
+                self._flush_sprites()
+                self._release_render_targets()
+                self.internal_res = internal_res
+                self._create_render_targets()
+                self._write_resolution_uniforms()
+                self._full_redraw = True
+            return self
+        if self.ctx is not None:
+            # The window changes, so the context goes with it; free what it owns first.
+            self.cleanup()
+
         self.internal_res = internal_res
         self.screen_res = screen_res
+        self._full_redraw = True
 
         # Always request a fresh OpenGL context when switching backends.
         pygame.display.quit()
@@ -37,29 +149,12 @@ class OpenGLBackend(GraphicsBackend):
         pygame.display.set_mode(screen_res, pygame.DOUBLEBUF | pygame.OPENGL)
         pygame.display.set_caption(title)
         self.ctx = moderngl.create_context()
+        self.ctx.enable(moderngl.BLEND)
 
-        self.projection_matrix = self._build_ortho_matrix()
-
-        # Full-screen quad for post-processing (vertices + uv)
-        vertices = np.array([
-            -1.0, -1.0, 0.0, 1.0,   # bottom-left
-             1.0, -1.0, 1.0, 1.0,   # bottom-right
-            -1.0,  1.0, 0.0, 0.0,   # top-left
-             1.0,  1.0, 1.0, 0.0,   # top-right
-        ], dtype='f4')
-        self.vbo = self.ctx.buffer(vertices)
+        # Full-screen passthrough for the final upscale
         self.quad_vao = self.ctx.vertex_array(
             self.ctx.program(
-                vertex_shader='''
-                    #version 330
-                    in vec2 in_vert;
-                    in vec2 in_uv;
-                    out vec2 uv;
-                    void main() {
-                        gl_Position = vec4(in_vert, 0.0, 1.0);
-                        uv = in_uv;
-                    }
-                ''',
+                vertex_shader=FULLSCREEN_VERTEX_SHADER,
                 fragment_shader='''
                     #version 330
                     uniform sampler2D texture0;
@@ -70,233 +165,572 @@ class OpenGLBackend(GraphicsBackend):
                     }
                 '''
             ),
-            [(self.vbo, '2f 2f', 'in_vert', 'in_uv')]
+            [],
         )
 
-        # Main framebuffer (color + depth)
-        self.texture = self.ctx.texture(internal_res, 3)
-        self.depth_tex = self.ctx.depth_texture(internal_res)
-        self.fbo = self.ctx.framebuffer(color_attachments=[self.texture], depth_attachment=self.depth_tex)
-
-        # Post-processing framebuffer
-        self.post_texture = self.ctx.texture(internal_res, 3)
-        self.post_fbo = self.ctx.framebuffer(color_attachments=[self.post_texture])
+        self._create_render_targets()
 
-        # Bloom framebuffer (optional, 4 channels for alpha)
-        self.bloom_texture = self.ctx.texture(internal_res, 4)
-        self.bloom_fbo = self.ctx.framebuffer(color_attachments=[self.bloom_texture])
-
-        # Sprite shader (simple textured quad)
+        # Sprite shader (instanced unit quad, one instance per sprite)
         self.sprite_shader = self.ctx.program(
             vertex_shader='''
                 #version 330
-                in vec2 in_pos;
-                in vec2 in_uv;
-                uniform mat4 projection;
+                in vec2 in_corner;
+                in vec4 in_rect;
+                in vec4 in_uv;
+                in vec4 in_color;
+                uniform vec2 u_scale;  // (2/W, -2/H): pixel coords, y down, to NDC
                 out vec2 uv;
+                out vec4 color;
                 void main() {
-                    gl_Position = projection * vec4(in_pos, 0.0, 1.0);
-                    uv = in_uv;
+                    vec2 pos = in_rect.xy + in_corner * in_rect.zw;
+                    gl_Position = vec4(pos * u_scale + vec2(-1.0, 1.0), 0.0, 1.0);
+                    uv = mix(in_uv.xy, in_uv.zw, in_corner);
+                    color = in_color;
                 }
             ''',
             fragment_shader='''
                 #version 330
                 uniform sampler2D sprite_tex;
                 in vec2 uv;
+                in vec4 color;
                 out vec4 f_color;
                 void main() {
-                    f_color = texture(sprite_tex, uv);
+                    f_color = texture(sprite_tex, uv) * color;
                 }
             '''
         )
-        self.sprite_shader['projection'].write(self.projection_matrix.astype('f4').tobytes())
+        self.sprite_shader['sprite_tex'] = 0
 
-        # Text shader (similar to sprite, but with color modulation)
-        self.text_shader = self.ctx.program(
-            vertex_shader='''
-                #version 330
-                in vec2 in_pos;
-                in vec2 in_uv;
-                uniform mat4 projection;
-                out vec2 uv;
-                void main() {
-                    gl_Position = projection * vec4(in_pos, 0.0, 1.0);
-                    uv = in_uv;
-                }
-            ''',
+        # Static unit quad plus a streaming per-instance buffer shared by every sprite
+        corners = np.array([0.0, 0.0, 1.0, 0.0, 0.0, 1.0, 1.0, 1.0], dtype='f4')
+        self.sprite_quad_vbo = self.ctx.buffer(corners)
+        self.instance_vbo = self.ctx.buffer(reserve=MAX_SPRITES * INSTANCE_BYTES, dynamic=True)
+        self.sprite_vao = self.ctx.vertex_array(
+            self.sprite_shader,
+            [
+                (self.sprite_quad_vbo, '2f', 'in_corner'),
+                (self.instance_vbo, '4f 4f 4f 4x/i', 'in_rect', 'in_uv', 'in_color'),
+            ],
+        )
+        # Attribute locations and record offsets for rebinding texture runs mid-buffer
+        self._instance_attribs = [
+            (self.sprite_shader['in_' + field].location, INSTANCE_DTYPE.fields[field][1])
+            for field in ('rect', 'uv', 'color')
+        ]
+        self._bound_first = 0
+
+        # Glyph atlas: coverage only, the per-instance color supplies rgb and scales alpha.
+        self.glyph_atlas = self.ctx.texture((GLYPH_ATLAS_SIZE, GLYPH_ATLAS_SIZE), 4)
+        self.glyph_atlas.swizzle = '111A'
+        self.glyph_atlas.filter = (moderngl.LINEAR, moderngl.LINEAR)
+        self._reset_glyph_atlas()
+
+        # Lighting shader: modulates the scene by the light mask's alpha
+        self.lighting_shader = self.ctx.program(
+            vertex_shader=FULLSCREEN_VERTEX_SHADER,
             fragment_shader='''
                 #version 330
-                uniform sampler2D text_tex;
-                uniform vec4 text_color;
+                uniform sampler2D colorTex;
+                uniform sampler2D lightTex;
                 in vec2 uv;
                 out vec4 f_color;
                 void main() {
-                    vec4 tex = texture(text_tex, uv);
-                    f_color = vec4(text_color.rgb, tex.a * text_color.a);
+                    vec4 color = texture(colorTex, uv);
+                    vec4 light = texture(lightTex, vec2(uv.x, 1.0 - uv.y));
+                    f_color = vec4(color.rgb * light.a, 1.0);
                 }
             '''
         )
-        self.text_shader['projection'].write(self.projection_matrix.astype('f4').tobytes())
+        self.lighting_shader['colorTex'] = 0
+        self.lighting_shader['lightTex'] = 1
+        self.lighting_vao = self.ctx.vertex_array(self.lighting_shader, [])
+        # Persistent light mask texture, rewritten in place every frame
+        self.light_tex = self.ctx.texture(internal_res, 4)
+        self.light_tex.swizzle = 'BGRA'
+        self._upload_ring = [
+            self.ctx.buffer(reserve=internal_res[0] * internal_res[1] * 4, dynamic=True)
+            for _ in range(UPLOAD_RING_SIZE)
+        ]
+        self._upload_index = 0
 
-        # DOF shader (using depth texture)
-        self.dof_shader = self.ctx.program(
-            vertex_shader='''
-                #version 330
-                in vec2 in_vert;
-                in vec2 in_uv;
-                out vec2 uv;
-                void main() {
-                    gl_Position = vec4(in_vert, 0.0, 1.0);
-                    uv = in_uv;
-                }
-            ''',
+        # Point light shader: accumulates lights analytically, no mask upload
+        self.point_light_shader = self.ctx.program(
+            vertex_shader=FULLSCREEN_VERTEX_SHADER,
             fragment_shader='''
                 #version 330
                 uniform sampler2D colorTex;
-                uniform sampler2D depthTex;
-                uniform float focalDistance;
-                uniform float focalRange;
+                uniform vec3 ambient;
+                uniform float height;
+                uniform int numLights;
+                layout(std140) uniform Lights {
+                    vec4 lights[%d];  // per light: (x, y, radius, 0), (r, g, b, 0)
+                };
                 in vec2 uv;
                 out vec4 f_color;
-
-                vec4 blur(sampler2D tex, vec2 uv, float amount) {
-                    // Simple 3x3 box blur
-                    vec4 col = vec4(0.0);
-                    float step = amount * 0.002;
-                    for (int x = -1; x <= 1; x++) {
-                        for (int y = -1; y <= 1; y++) {
-                            col += texture(tex, uv + vec2(x*step, y*step));
-                        }
+                void main() {
+                    // Internal pixel coordinates, y down like pygame
+                    vec2 p = vec2(gl_FragCoord.x, height - gl_FragCoord.y);
+                    vec3 light = ambient;
+                    for (int i = 0; i < numLights; i++) {
+                        vec4 shape = lights[2 * i];
+                        float att = 1.0 - smoothstep(0.0, shape.z, length(p - shape.xy));
+                        light += lights[2 * i + 1].rgb * att;
                     }
-                    return col / 9.0;
+                    f_color = vec4(texture(colorTex, uv).rgb * min(light, 1.0), 1.0);
                 }
+            ''' % (MAX_LIGHTS * 2)
+        )
+        self.point_light_shader['colorTex'] = 0
+        self.point_light_shader['Lights'].binding = 0
+        self.point_light_vao = self.ctx.vertex_array(self.point_light_shader, [])
+        self.light_ubo = self.ctx.buffer(reserve=MAX_LIGHTS * LIGHT_BYTES, dynamic=True)
+        self._uploaded_lights = []
 
-                void main() {
-                    float depth = texture(depthTex, uv).r;
-                    float blurAmount = smoothstep(0.0, focalRange, abs(depth - focalDistance));
-                    f_color = blur(colorTex, uv, blurAmount);
-                }
-            '''
+        # DOF: separable Gaussian, horizontal into bloom_fbo, vertical onto the screen.
+        # Focus settings live in a uniform block both passes read.
+        self.dof_h_shader = self.ctx.program(
+            vertex_shader=FULLSCREEN_VERTEX_SHADER,
+            fragment_shader=_dof_fragment_shader('1.0, 0.0'),
         )
+        self.dof_v_shader = self.ctx.program(
+            vertex_shader=FULLSCREEN_VERTEX_SHADER,
+            fragment_shader=_dof_fragment_shader('0.0, 1.0'),
+        )
+        self.dof_h_vao = self.ctx.vertex_array(self.dof_h_shader, [])
+        self.dof_v_vao = self.ctx.vertex_array(self.dof_v_shader, [])
+        self.dof_h_shader['colorTex'] = 0
+        self.dof_h_shader['depthTex'] = 1
+        self.dof_v_shader['colorTex'] = 2
+        self.dof_v_shader['depthTex'] = 1
+        self.dof_ubo = self.ctx.buffer(reserve=16)
+        for program in (self.dof_h_shader, self.dof_v_shader):
+            program['DepthOfField'].binding = 1
+        self.set_depth_of_field(DOF_FOCAL_DISTANCE, DOF_FOCAL_RANGE, enabled=False)
+        self._write_resolution_uniforms()
 
         return self
 
-    def _build_ortho_matrix(self):
-        left, right = 0, self.internal_res[0]
-        bottom, top = self.internal_res[1], 0  # flip Y to match pygame
-        near, far = -1, 1
-        return np.array([
-            [2/(right-left), 0, 0, -(right+left)/(right-left)],
-            [0, 2/(top-bottom), 0, -(top+bottom)/(top-bottom)],
-            [0, 0, -2/(far-near), -(far+near)/(far-near)],
-            [0, 0, 0, 1]
-        ], dtype='f4')
+    def _write_resolution_uniforms(self):
+        """Upload the uniforms derived from the internal resolution; only re-run when it changes."""
+        width, height = self.internal_res
+        self.sprite_shader['u_scale'] = (2.0 / width, -2.0 / height)
+        self.point_light_shader['height'] = float(height)
+
+    def _create_render_targets(self):
+        """Create the framebuffers sized to the internal resolution."""
+        # Main framebuffer (color + depth)
+        self.texture = self.ctx.texture(self.internal_res, 3)
+        self.depth_tex = self.ctx.depth_texture(self.internal_res)
+        self.depth_tex.compare_func = ''  # sampled as plain depth values by the DOF passes
+        self.fbo = self.ctx.framebuffer(color_attachments=[self.texture], depth_attachment=self.depth_tex)
+
+        # Post-processing framebuffer
+        self.post_texture = self.ctx.texture(self.internal_res, 3)
+        self.post_fbo = self.ctx.framebuffer(color_attachments=[self.post_texture])
+
+        # Bloom framebuffer (optional, 4 channels for alpha)
+        self.bloom_texture = self.ctx.texture(self.internal_res, 4)
+        self.bloom_fbo = self.ctx.framebuffer(color_attachments=[self.bloom_texture])
+
+    def _release_render_targets(self):
+        for obj in (self.fbo, self.post_fbo, self.bloom_fbo,
+                    self.texture, self.depth_tex, self.post_texture, self.bloom_texture):
+            if obj:
+                obj.release()
+
+    def set_depth_of_field(self, focal_distance, focal_range, enabled=True):
+        """Update the DOF focus; one small buffer write, shared by both blur passes."""
+        self.dof_ubo.write(np.array([focal_distance, focal_range, 0.0, 0.0], dtype='f4'))
+        self.dof_enabled = enabled
+
+    def mark_dirty(self, rect):
+        """Limit the next frame to the union of the marked rects (internal coordinates)."""
+        self._dirty.append(pygame.Rect(rect))
+
+    def frame_clip(self):
+        return self._clip
 
     def begin_frame(self):
+        self._release_freed_textures()
+        self._scissor = self._clip = None
+        if self._dirty and not self._full_redraw:
+            width, height = self.internal_res
+            union = self._dirty[0].unionall(self._dirty[1:]).clip(pygame.Rect(0, 0, width, height))
+            # GL scissor origin is bottom-left; the framebuffer is y-down like pygame
+            self._scissor = (union.x, height - union.bottom, union.width, union.height)
+            self._clip = union
+        self._dirty.clear()
+        self._full_redraw = False
+        self.fbo.scissor = self._scissor
+        self.post_fbo.scissor = self._scissor
         self.fbo.use()
         self.fbo.clear(0.2, 0.2, 0.25, 1.0)
-        self.sprite_batch.clear()  # clear batch list
+        self._batch_n = 0
+        self._batch_textures.clear()
 
     def draw_surface(self, surface, rect):
-        """Convert pygame Surface to texture and draw immediately (simplified)."""
-        # Convert surface to raw RGBA data
-        mode = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
-        data = pygame.image.tostring(surface, mode, True)
-        tex = self.ctx.texture(surface.get_size(), 4 if mode == 'RGBA' else 3, data)
+        """Queue a sprite instance; queued sprites are drawn in order on the next flush."""
+        tex = self._get_texture(surface)
+        self._queue_instance(tex, rect.x, rect.y, rect.width, rect.height, (0.0, 0.0, 1.0, 1.0), WHITE)
+
+    def _queue_instance(self, tex, x, y, width, height, uv, color):
+        if self._batch_n >= MAX_SPRITES:
+            self._flush_sprites()
+        self._instances[self._batch_n] = ((x, y, width, height), uv, color, tex.glo)
+        self._batch_textures[tex.glo] = tex
+        self._batch_n += 1
+
+    def _flush_sprites(self):
+        """Upload queued instances once and issue one instanced draw per texture run."""
+        count = self._batch_n
+        if not count:
+            return
+        batch = self._instances[:count]
+        tex_ids = batch['tex']
+        bounds = [0, *(np.flatnonzero(tex_ids[1:] != tex_ids[:-1]) + 1).tolist(), count]
+        if len(bounds) > 2:
+            batch = self._group_by_texture(batch, bounds)
+            tex_ids = batch['tex']
+            bounds = [0, *(np.flatnonzero(tex_ids[1:] != tex_ids[:-1]) + 1).tolist(), count]
+        # Orphan first so a mid-frame flush never waits on draws still reading the old store
+        self.instance_vbo.orphan()
+        self.instance_vbo.write(batch)
+        for first, end in zip(bounds, bounds[1:]):
+            self._bind_instances(first)
+            self._batch_textures[int(tex_ids[first])].use(0)
+            self.sprite_vao.render(moderngl.TRIANGLE_STRIP, vertices=4, instances=end - first)
+        self._batch_n = 0
+        self._batch_textures.clear()
+
+    @staticmethod
+    def _group_by_texture(batch, bounds):
+        """Reorder texture runs so equal textures are adjacent, without changing what is drawn.
+
+        A run is moved back to the last group using its texture only when it does
+        not overlap anything queued in between, so blending order is preserved.
+        """
+        rect = batch['rect']
+        starts = bounds[:-1]
+        # Bounding box of each run: left, top, right, bottom
+        boxes = np.stack([
+            np.minimum.reduceat(rect[:, 0], starts),
+            np.minimum.reduceat(rect[:, 1], starts),
+            np.maximum.reduceat(rect[:, 0] + rect[:, 2], starts),
+            np.maximum.reduceat(rect[:, 1] + rect[:, 3], starts),
+        ], axis=1).tolist()
+        tex_ids = batch['tex'][starts].tolist()
+        groups = []  # [texture, run boxes, run indices] in draw order
+        for run, (tex, box) in enumerate(zip(tex_ids, boxes)):
+            left, top, right, bottom = box
+            target = None
+            for group in reversed(groups):
+                if group[0] == tex:
+                    target = group
+                    break
+                if any(l < right and left < r and t < bottom and top < b for l, t, r, b in group[1]):
+                    break
+            if target is None:
+                groups.append([tex, [box], [run]])
+            else:
+                target[1].append(box)
+                target[2].append(run)
+        if len(groups) == len(starts):
+            return batch
+        order = np.concatenate([np.arange(bounds[run], bounds[run + 1]) for group in groups for run in group[2]])
+        return batch[order]
+
+    def _bind_instances(self, first):
+        """Point the per-instance attributes at the run starting at instance `first`."""
+        if first == self._bound_first:
+            return
+        offset = first * INSTANCE_BYTES
+        for location, field_offset in self._instance_attribs:
+            self.sprite_vao.bind(
+                location, 'f', self.instance_vbo, '4f',
+                offset=offset + field_offset, stride=INSTANCE_BYTES, divisor=1,
+            )
+        self._bound_first = first
+
+    def _get_texture(self, surface):
+        """Return the cached texture for a surface, uploading it on first use.
+
+        Surfaces are treated as immutable: callers replace an entity image rather
+        than drawing into it, so identity is enough to key the cache. Code that
+        does draw into a cached surface calls invalidate_surface afterwards.
+        """
+        key = id(surface)
+        entry = self._texture_cache.get(key)
+        if entry is not None:
+            if entry[0]() is surface:
+                self._texture_cache.move_to_end(key)
+                return entry[1]
+            # The id now belongs to a new surface; drop the stale texture.
+            del self._texture_cache[key]
+            self._flush_sprites()
+            entry[1].release()
+
+        if len(self._texture_cache) >= TEXTURE_CACHE_SIZE:
+            # Queued quads may still reference the texture about to be evicted.
+            self._flush_sprites()
+            _, (_, old_tex, finalizer) = self._texture_cache.popitem(last=False)
+            finalizer.detach()
+            old_tex.release()
+
+        tex = self._upload_surface(surface)
+        # GPU memory follows the surface: its key is queued for release when it is collected.
+        finalizer = weakref.finalize(surface, self._freed_surfaces.append, key)
+        self._texture_cache[key] = (weakref.ref(surface), tex, finalizer)
+        return tex
+
+    def _release_freed_textures(self):
+        """Release textures of collected surfaces; called between frames when nothing is queued."""
+        while self._freed_surfaces:
+            key = self._freed_surfaces.pop()
+            entry = self._texture_cache.get(key)
+            # Skip keys already reused by a live surface
+            if entry is not None and entry[0]() is None:
+                del self._texture_cache[key]
+                entry[1].release()
+
+    def invalidate_surface(self, surface):
+        """Re-upload a cached surface whose pixels were drawn into."""
+        entry = self._texture_cache.get(id(surface))
+        if entry is None or entry[0]() is not surface:
+            return
+        tex = entry[1]
+        if tex.glo in self._batch_textures:
+            # Quads queued earlier this frame still show the old pixels
+            self._flush_sprites()
+        pixels = self._pixel_source(surface)
+        if pixels.get_size() == tex.size:
+            self._staged_write(tex, pixels.get_view('1'))
+        else:
+            del self._texture_cache[id(surface)]
+            entry[2].detach()
+            tex.release()
+
+    def _staged_write(self, tex, pixels):
+        """Rewrite a texture through the next staging buffer instead of straight from client memory."""
+        buffer = self._upload_ring[self._upload_index]
+        self._upload_index = (self._upload_index + 1) % len(self._upload_ring)
+        if buffer.size < pixels.length:
+            buffer.orphan(pixels.length)
+        buffer.write(pixels)
+        tex.write(buffer)
+
+    def prepare_surface(self, surface):
+        """Repack a loaded surface once so uploads can read its buffer without converting."""
+        return self._pixel_source(surface)
+
+    def _upload_surface(self, surface):
+        """Create a texture straight from the surface's pixel buffer (no tostring copy)."""
+        surface = self._pixel_source(surface)
+        tex = self.ctx.texture(surface.get_size(), 4, surface.get_view('1'))
+        tex.swizzle = self._swizzle_for(surface)
         tex.filter = (moderngl.LINEAR, moderngl.LINEAR)
-        tex.use(0)
-        self.sprite_shader['sprite_tex'] = 0
+        return tex
 
-        # Build vertex data for this sprite
-        x, y, w, h = rect.x, rect.y, rect.width, rect.height
-        vertices = np.array([
-            x,   y,   0, 0,
-            x+w, y,   1, 0,
-            x,   y+h, 0, 1,
-            x+w, y+h, 1, 1
-        ], dtype='f4')
-        vbo = self.ctx.buffer(vertices)
-        vao = self.ctx.vertex_array(self.sprite_shader, [(vbo, '2f 2f', 'in_pos', 'in_uv')])
-        vao.render(moderngl.TRIANGLE_STRIP)
-        vbo.release()
-        tex.release()
+    @staticmethod
+    def _pixel_source(surface):
+        """Return the surface itself when its buffer is tightly packed 32-bit, else a converted copy."""
+        width, height = surface.get_size()
+        if surface.get_bitsize() == 32 and surface.get_pitch() == width * 4 and not surface.get_colorkey():
+            return surface
+        converted = pygame.Surface((width, height), pygame.SRCALPHA, 32)
+        converted.fill((0, 0, 0, 0))
+        converted.blit(surface, (0, 0))
+        return converted
+
+    @staticmethod
+    def _swizzle_for(surface):
+        """Map the surface's byte order (usually BGRA) onto RGBA texture channels."""
+        channels = 'RGBA'
+        shifts = surface.get_shifts()
+        swizzle = ''.join(channels[shift // 8] for shift in shifts[:3])
+        return swizzle + (channels[shifts[3] // 8] if surface.get_masks()[3] else '1')
 
     def draw_rect(self, rect, color):
-        """Draw a filled rectangle using a temporary 1x1 texture."""
-        surf = pygame.Surface((1, 1))
-        surf.fill(color)
-        self.draw_surface(surf, rect)
+        """Queue a filled rectangle as a tinted quad over the glyph atlas's opaque texel."""
+        self._queue_instance(self.glyph_atlas, rect.x, rect.y, rect.width, rect.height, SOLID_UV, self._tint(color))
 
     def draw_text(self, text, position, color, font):
-        """Render text using pygame.font and draw as texture."""
+        """Queue one tinted quad per glyph from the shared glyph atlas."""
         if not text:
             return
-        surf = font.render(text, True, color)
-        rect = pygame.Rect(position[0], position[1], surf.get_width(), surf.get_height())
-        self.draw_surface(surf, rect)
+        # freetype fonts can be resized in place, so their size is part of the key
+        font_key = (font, font.size) if isinstance(font, pygame.freetype.Font) else font
+        glyphs = self._resolve_glyphs(font, font_key, text)
+        if glyphs is None:
+            self._draw_text_surface(text, position, color, font, font_key)
+            return
+        tint = self._tint(color)
+        x, y = position
+        for u0, v0, u1, v1, width, height, x_offset, advance in glyphs:
+            self._queue_instance(self.glyph_atlas, round(x) + x_offset, y, width, height, (u0, v0, u1, v1), tint)
+            x += advance
+
+    def _resolve_glyphs(self, font, font_key, text):
+        """Atlas entries for every character of text, or None when they cannot share the atlas.
+
+        Filling the atlas partway through wipes it, so the glyphs gathered before
+        that would sample overwritten texels; the string is then gathered again
+        from the fresh atlas, and falls back if it overflows that too.
+        """
+        for _ in range(2):
+            generation = self._glyph_generation
+            glyphs = []
+            for ch in text:
+                glyph = self._glyphs.get((font_key, ch)) or self._add_glyph(font, font_key, ch)
+                if glyph is None:
+                    return None
+                if self._glyph_generation != generation:
+                    break
+                glyphs.append(glyph)
+            else:
+                return glyphs
+        return None
+
+    def _draw_text_surface(self, text, position, color, font, font_key):
+        """Render a whole string to its own surface, for glyphs the atlas cannot hold.
+
+        The surface is kept across frames so its cached texture is reused too.
+        """
+        key = (font_key, text, tuple(color))
+        entry = self._text_surfaces.get(key)
+        if entry is not None:
+            self._text_surfaces.move_to_end(key)
+        else:
+            if isinstance(font, pygame.freetype.Font):
+                surf, bounds = font.render(text, color)
+                entry = (surf, bounds.x, font.get_sized_ascender() - bounds.y)
+            else:
+                entry = (font.render(text, True, color), 0, 0)
+            self._text_surfaces[key] = entry
+            if len(self._text_surfaces) > TEXT_SURFACE_CACHE_SIZE:
+                self._text_surfaces.popitem(last=False)
+        surf, x_offset, y_offset = entry
+        x, y = position[0] + x_offset, position[1] + y_offset
+        self.draw_surface(surf, pygame.Rect(x, y, surf.get_width(), surf.get_height()))
+
+    @staticmethod
+    def _tint(color):
+        """Convert a pygame RGB(A) color to normalized instance color."""
+        return tuple(c / 255.0 for c in color[:3]) + ((color[3] / 255.0,) if len(color) > 3 else (1.0,))
+
+    def _add_glyph(self, font, font_key, ch):
+        """Rasterize a glyph into the next free shelf slot; returns None if it can never fit."""
+        cell, x_offset, advance = self._render_glyph(font, ch)
+        width, height = cell.get_size()
+        if width + GLYPH_PADDING > GLYPH_ATLAS_SIZE or height + GLYPH_PADDING > GLYPH_ATLAS_SIZE:
+            return None
+        x, y, row_h = self._shelf
+        if x + width + GLYPH_PADDING > GLYPH_ATLAS_SIZE:
+            x, y, row_h = 0, y + row_h, 0
+        if y + height + GLYPH_PADDING > GLYPH_ATLAS_SIZE:
+            # Atlas full: draw what still samples it, then start over.
+            self._flush_sprites()
+            self._reset_glyph_atlas()
+            x, y, row_h = self._shelf
+        if width and height:
+            self.glyph_atlas.write(cell.get_view('1'), viewport=(x, y, width, height))
+        self._shelf = [x + width + GLYPH_PADDING, y, max(row_h, height + GLYPH_PADDING)]
+        size = GLYPH_ATLAS_SIZE
+        glyph = (x / size, y / size, (x + width) / size, (y + height) / size, width, height, x_offset, advance)
+        self._glyphs[(font_key, ch)] = glyph
+        return glyph
+
+    def _reset_glyph_atlas(self):
+        self._glyphs.clear()
+        self._glyph_generation += 1
+        if self.glyph_atlas is not None:
+            # Stale texels in the padding would bleed into glyph edges under linear filtering.
+            # Texel (0, 0) stays opaque so solid rects batch in the same texture run as text.
+            self.glyph_atlas.write(bytes(GLYPH_ATLAS_SIZE * GLYPH_ATLAS_SIZE * 4))
+            self.glyph_atlas.write(b'\xff\xff\xff\xff', viewport=(0, 0, 1, 1))
+        # the first shelf starts past the opaque texel so glyph edges never filter it in
+        self._shelf = [1 + GLYPH_PADDING, GLYPH_PADDING, 0]
+
+    @staticmethod
+    def _render_glyph(font, ch):
+        """Rasterize one character as a full-line-height cell; returns (surface, x_offset, advance)."""
+        if not isinstance(font, pygame.freetype.Font):
+            glyph = font.render(ch, True, (255, 255, 255))
+            # Copy into a known BGRA layout so the atlas alpha swizzle holds
+            cell = pygame.Surface(glyph.get_size(), pygame.SRCALPHA, 32)
+            cell.fill((0, 0, 0, 0))
+            cell.blit(glyph, (0, 0))
+            return cell, 0, glyph.get_width()
+        # freetype renders the tight bounding box; place it on the baseline of a line-high cell
+        glyph, bounds = font.render(ch, (255, 255, 255))
+        metrics = font.get_metrics(ch)[0]
+        advance = metrics[4] if metrics else bounds.width
+        left = min(0, bounds.x)
+        cell = pygame.Surface((max(bounds.right, math.ceil(advance)) - left, font.get_sized_height()), pygame.SRCALPHA, 32)
+        cell.fill((0, 0, 0, 0))
+        cell.blit(glyph, (bounds.x - left, font.get_sized_ascender() - bounds.y))
+        return cell, left, advance
 
     def apply_lighting(self, light_mask):
         """Apply light mask by blending with main texture."""
-        # Convert light_mask (pygame Surface) to texture
-        data = pygame.image.tostring(light_mask, 'RGBA', True)
-        light_tex = self.ctx.texture(light_mask.get_size(), 4, data)
-        light_tex.filter = (moderngl.LINEAR, moderngl.LINEAR)
-        light_tex.use(1)
+        self._flush_sprites()
+        # Rows stay top-down and are flipped in the shader
+        pixels = self._pixel_source(light_mask)
+        if pixels.get_size() != self.light_tex.size:
+            self.light_tex.release()
+            self.light_tex = self.ctx.texture(pixels.get_size(), 4)
+            self.light_tex.swizzle = 'BGRA'
+        self._staged_write(self.light_tex, pixels.get_view('1'))
+        self.light_tex.use(1)
+        self._post_pass(self.lighting_vao)
+
+    def apply_lights(self, lighting):
+        """Light the frame from the light list on the GPU; no mask is rasterized or uploaded."""
+        self._flush_sprites()
+        lights = lighting.lights[:MAX_LIGHTS]
+        # Static scenes relight every frame with the same list; only upload when it changes
+        if lights and lights != self._uploaded_lights:
+            data = np.zeros((len(lights), 8), dtype='f4')
+            data[:, [0, 1, 2, 4, 5, 6]] = lights
+            data[:, 4:7] /= 255.0
+            self.light_ubo.orphan()
+            self.light_ubo.write(data)
+            self._uploaded_lights = lights
+        self.light_ubo.bind_to_uniform_block(0)
+        self.point_light_shader['numLights'] = len(lights)
+        self.point_light_shader['ambient'] = tuple(c / 255.0 for c in lighting.ambient[:3])
+        self._post_pass(self.point_light_vao)
 
-        # Use post_fbo to combine
+    def _post_pass(self, vao):
+        """Render a fullscreen pass reading the scene (texture unit 0) into post_fbo, then swap them."""
+        if self._scissor is not None:
+            # Outside the scissor post_fbo must keep the already lit previous frame
+            self.post_fbo.scissor = None
+            self.post_fbo.use()
+            self.ctx.copy_framebuffer(self.post_fbo, self.fbo)
+            self.post_fbo.scissor = self._scissor
         self.post_fbo.use()
-        self.post_fbo.clear()
         self.texture.use(0)
-
-        # Simple shader that multiplies color by light alpha (modulate)
-        # We'll reuse the quad_vao with a custom shader or modify the existing one.
-        # For simplicity, we'll create a temporary program.
-        prog = self.ctx.program(
-            vertex_shader='''
-                #version 330
-                in vec2 in_vert;
-                in vec2 in_uv;
-                out vec2 uv;
-                void main() {
-                    gl_Position = vec4(in_vert, 0.0, 1.0);
-                    uv = in_uv;
-                }
-            ''',
-            fragment_shader='''
-                #version 330
-                uniform sampler2D colorTex;
-                uniform sampler2D lightTex;
-                in vec2 uv;
-                out vec4 f_color;
-                void main() {
-                    vec4 color = texture(colorTex, uv);
-                    vec4 light = texture(lightTex, uv);
-                    f_color = vec4(color.rgb * light.a, 1.0);
-                }
-            '''
-        )
-        prog['colorTex'] = 0
-        prog['lightTex'] = 1
-        vao = self.ctx.vertex_array(prog, [(self.vbo, '2f 2f', 'in_vert', 'in_uv')])
-        vao.render(moderngl.TRIANGLE_STRIP)
+        vao.render(moderngl.TRIANGLES, vertices=3)
 
         # Swap fbo and post_fbo
         self.texture, self.post_texture = self.post_texture, self.texture
         self.fbo, self.post_fbo = self.post_fbo, self.fbo
 
-        light_tex.release()
-
     def end_frame(self):
-        # Apply DOF as post-processing (example)
-        self.ctx.screen.use()
-        self.ctx.screen.clear()
+        self._flush_sprites()
         self.texture.use(0)
-        self.depth_tex.use(1)
-        self.dof_shader['colorTex'] = 0
-        self.dof_shader['depthTex'] = 1
-        self.dof_shader['focalDistance'] = 0.5
-        self.dof_shader['focalRange'] = 0.3
-        self.quad_vao.render(moderngl.TRIANGLE_STRIP)
+        if self.dof_enabled:
+            # Depth of field: horizontal pass into bloom_fbo, vertical pass to the screen
+            self.depth_tex.use(1)
+            self.dof_ubo.bind_to_uniform_block(1)
+            self.bloom_fbo.use()
+            self.dof_h_vao.render(moderngl.TRIANGLES, vertices=3)
+            self.bloom_texture.use(2)
+            self.ctx.screen.use()
+            self.dof_v_vao.render(moderngl.TRIANGLES, vertices=3)
+        else:
+            self.ctx.screen.use()
+            self.quad_vao.render(moderngl.TRIANGLES, vertices=3)
         pygame.display.flip()
 
     def get_internal_surface(self):
@@ -306,15 +740,29 @@ class OpenGLBackend(GraphicsBackend):
     def cleanup(self):
         """Release OpenGL resources"""
         try:
-            if hasattr(self, 'vbo') and self.vbo:
-                self.vbo.release()
-            if hasattr(self, 'texture') and self.texture:
-                self.texture.release()
-            if hasattr(self, 'depth_tex') and self.depth_tex:
-                self.depth_tex.release()
-            if hasattr(self, 'post_texture') and self.post_texture:
-                self.post_texture.release()
-            if hasattr(self, 'bloom_texture') and self.bloom_texture:
-                self.bloom_texture.release()
+            for _, tex, finalizer in self._texture_cache.values():
+                finalizer.detach()
+                tex.release()
+            self._texture_cache.clear()
+            self._freed_surfaces.clear()
+            self._text_surfaces.clear()
+            if self.glyph_atlas:
+                self.glyph_atlas.release()
+                self.glyph_atlas = None
+            self._reset_glyph_atlas()
+            if self.light_tex:
+                self.light_tex.release()
+            if self.light_ubo:
+                self.light_ubo.release()
+            if self.dof_ubo:
+                self.dof_ubo.release()
+            for buffer in self._upload_ring:
+                buffer.release()
+            self._upload_ring = []
+            if self.instance_vbo:
+                self.instance_vbo.release()
+            if self.sprite_quad_vbo:
+                self.sprite_quad_vbo.release()
+            self._release_render_targets()
         except:
             pass
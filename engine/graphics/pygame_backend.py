@@ -1,33 +1,53 @@
 import pygame
+import pygame.freetype
 import os
 from .backend import GraphicsBackend
 
+# 0x00RRGGBB, the layout QImage.Format_RGB32 reads; an embedded frame can then be handed to Qt unconverted
+XRGB_MASKS = (0xFF0000, 0x00FF00, 0x0000FF, 0)
+
 class PygameBackend(GraphicsBackend):
     def __init__(self):
         self.internal_res = None
         self.screen_res = None
         self.internal_surface = None
-        self.scaled_surface = None
         self.window = None
         self.embedded = False
+        self._dirty = []  # internal-res rects changed since the last frame
+        self._clip = None
 
     def initialize(self, internal_res, screen_res, title="NeoPyxel"):
         self.internal_res = internal_res
         self.screen_res = screen_res
-        self.internal_surface = pygame.Surface(internal_res)
         self.embedded = "SDL_WINDOWID" in os.environ
 
         if self.embedded:
             # Embedded editor mode: render offscreen only and let Qt paint it.
-            self.scaled_surface = None
+            # The format is pinned rather than taken from whatever display mode is active.
+            self.internal_surface = pygame.Surface(internal_res, 0, 32, XRGB_MASKS)
             self.window = None
         else:
-            self.scaled_surface = pygame.Surface(screen_res)
+            self.internal_surface = pygame.Surface(internal_res)
             self.window = pygame.display.set_mode(screen_res, pygame.DOUBLEBUF)
             pygame.display.set_caption(title)
+            # end_frame scales straight into the window, which needs matching pixel formats
+            self.internal_surface = self.internal_surface.convert(self.window)
         return self
 
+    def mark_dirty(self, rect):
+        """Limit the next frame to the union of the marked rects; the rest keeps last frame's pixels."""
+        self._dirty.append(pygame.Rect(rect))
+
+    def frame_clip(self):
+        return self._clip
+
     def begin_frame(self):
+        self._clip = None
+        if self._dirty:
+            self._clip = self._dirty[0].unionall(self._dirty[1:]).clip(self.internal_surface.get_rect())
+            self._dirty.clear()
+        # fill, blits and text all honour the surface clip
+        self.internal_surface.set_clip(self._clip)
         self.internal_surface.fill((20, 20, 25))
 
     def draw_rect(self, rect, color):
@@ -36,18 +56,27 @@ class PygameBackend(GraphicsBackend):
     def draw_surface(self, surface, rect):
         self.internal_surface.blit(surface, rect)
 
+    def draw_surfaces(self, blits):
+        self.internal_surface.blits(blits, doreturn=False)
+
     def apply_lighting(self, light_mask):
         self.internal_surface.blit(light_mask, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
 
     def draw_text(self, text, position, color, font):
+        if isinstance(font, pygame.freetype.Font):
+            # Render straight into the frame; render_to places the glyph bounding box,
+            # so shift it to keep `position` as the line's top-left like pygame.font.
+            bounds = font.get_rect(text)
+            dest = (position[0] + bounds.x, position[1] + font.get_sized_ascender() - bounds.y)
+            font.render_to(self.internal_surface, dest, text, color)
+            return
         text_surf = font.render(text, True, color)
         self.internal_surface.blit(text_surf, position)
 
     def end_frame(self):
         if self.embedded or not self.window:
             return
-        pygame.transform.scale(self.internal_surface, self.screen_res, self.scaled_surface)
-        self.window.blit(self.scaled_surface, (0, 0))
+        pygame.transform.scale(self.internal_surface, self.screen_res, self.window)
         pygame.display.flip()
 
     def get_internal_surface(self):
@@ -1,16 +1,26 @@
+import pygame
+
 class Renderer:
     def __init__(self, backend, internal_res, screen_res):
         self.backend = backend
         self.internal_res = internal_res
         self.screen_res = screen_res
+        self.screen_rect = pygame.Rect(0, 0, *internal_res)
         self.backend.initialize(internal_res, screen_res)
 
     def render(self, entities, lighting=None, ui=None, clock=None):
         self.backend.begin_frame()
-        for entity in entities:
-            self.backend.draw_surface(entity.image, entity.rect)
+        # A partial frame keeps everything outside its clip, so only entities touching it are drawn
+        visible = self.backend.frame_clip() or self.screen_rect
+        # Off-screen entities would only cost a texture upload and a draw
+        if hasattr(entities, "visible_blits"):
+            # An EntityManager culls on its position/size arrays in one pass
+            self.backend.draw_surfaces(entities.visible_blits(visible))
+            entities = entities.entities
+        else:
+            self.backend.draw_surfaces([(e.image, e.rect) for e in entities if visible.colliderect(e.rect)])
         if lighting:
-            self.backend.apply_lighting(lighting.get_mask())
+            self.backend.apply_lights(lighting)
         if ui and clock:
             ui.draw_status(self.backend, clock, {"Entities": len(entities)})
         self.backend.end_frame()
@@ -2,6 +2,12 @@
 from .backend import GraphicsBackend
 import warnings
 
+# Calls forwarded straight to the OpenGL fallback once it exists
+FORWARDED_METHODS = (
+    "begin_frame", "mark_dirty", "frame_clip", "invalidate_surface", "prepare_surface", "draw_rect",
+    "draw_surface", "draw_surfaces", "apply_lighting", "apply_lights", "draw_text", "end_frame", "get_internal_surface", "cleanup",
+)
+
 class VulkanBackend(GraphicsBackend):
     def __init__(self):
         self.initialized = False
@@ -11,39 +17,41 @@ class VulkanBackend(GraphicsBackend):
         # Fallback to OpenGL by importing and using it
         from .opengl_backend import OpenGLBackend
         self._fallback = OpenGLBackend()
+        # Bind the fallback's methods onto the instance so per-draw calls skip this proxy
+        for name in FORWARDED_METHODS:
+            setattr(self, name, getattr(self._fallback, name))
         return self._fallback.initialize(internal_res, screen_res, title)
 
+    # Until initialize() binds the fallback, every call is a no-op.
     def begin_frame(self):
-        if hasattr(self, '_fallback'):
-            return self._fallback.begin_frame()
         pass
 
     def draw_rect(self, rect, color):
-        if hasattr(self, '_fallback'):
-            return self._fallback.draw_rect(rect, color)
         pass
 
     def draw_surface(self, surface, rect):
-        if hasattr(self, '_fallback'):
-            return self._fallback.draw_surface(surface, rect)
+        pass
+
+    def draw_surfaces(self, blits):
+        pass
 
     def apply_lighting(self, light_mask):
-        if hasattr(self, '_fallback'):
-            return self._fallback.apply_lighting(light_mask)
+        pass
+
+    def apply_lights(self, lighting):
+        pass
+
+    def prepare_surface(self, surface):
+        return surface
 
     def draw_text(self, text, position, color, font):
-        if hasattr(self, '_fallback'):
-            return self._fallback.draw_text(text, position, color, font)
+        pass
 
     def end_frame(self):
-        if hasattr(self, '_fallback'):
-            return self._fallback.end_frame()
+        pass
 
     def get_internal_surface(self):
-        if hasattr(self, '_fallback'):
-            return self._fallback.get_internal_surface()
         return None
 
     def cleanup(self):
-        if hasattr(self, '_fallback'):
-            return self._fallback.cleanup()
+        pass
@@ -1,19 +1,137 @@
+from collections import OrderedDict
+
+import numpy as np
 import pygame
 
+AMBIENT = (30, 30, 50)
+ACCUM_HEADROOM = 256  # overlapping lights a uint16 sum of 255s holds before it could wrap
+FFT_MIN_LIGHTS = 64  # below this the per-light path always beats the convolution's fixed cost
+FFT_LIGHT_COVERAGE = 16  # splat a group by convolution once its lights cover the mask this many times over
+KERNEL_SPECTRA_CACHE_SIZE = 8  # a few MB each at editor resolutions
+
+def _fft_length(n):
+    """Smallest 2^a * 3^b * 5^c >= n; pocketfft is several times faster on these."""
+    best = 1 << max(n - 1, 0).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            size = p35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            p35 *= 3
+        p5 *= 5
+    return best
+
 class DynamicLighting:
-    def __init__(self, res):
+    def __init__(self, res, ambient=AMBIENT):
         self.light_mask = pygame.Surface(res, pygame.SRCALPHA)
-        self.lights = []
+        self.ambient = ambient
+        self.lights = []  # (x, y, radius, r, g, b)
+        self._light_cache = {}  # (radius, color) -> prebuilt radial gradient, rgba uint8 rows
+        self._kernel_spectra = OrderedDict()  # (radius, color) -> FFTs of its coverage and alpha kernels
+        self._accum = np.zeros((res[1], res[0], 4), dtype=np.uint16)  # lights are summed here, then clamped
+        self._mask_dirty = True
 
     def clear(self):
-        self.light_mask.fill((30, 30, 50))  # ambient
+        self.lights.clear()
+        self._mask_dirty = True
+
+    def _light_gradient(self, radius, color):
+        """Build the radial gradient for a light once with numpy, then reuse it."""
+        key = (radius, tuple(color))
+        gradient = self._light_cache.get(key)
+        if gradient is not None:
+            return gradient
+        # Distances from the center measured at pixel centers
+        yy, xx = np.ogrid[-radius:radius, -radius:radius]
+        d = np.sqrt((xx + 0.5) ** 2 + (yy + 0.5) ** 2)
+        inside = d < radius
+        rgba = np.zeros((radius * 2, radius * 2, 4), dtype=np.uint8)
+        rgba[inside, :3] = color[:3]
+        rgba[..., 3] = np.where(inside, np.clip(150 * (1 - d / radius), 0, 255), 0).astype(np.uint8)
+        self._light_cache[key] = rgba
+        return rgba
+
+    def _convolve_dense_groups(self, accum):
+        """Add groups of identical lights that would overlap heavily with one FFT convolution each.
+
+        Blitting costs N * (2r)^2 per group while the convolution costs about the
+        same whatever N is. Returns the lights left for the per-light path.
+        """
+        height, width = accum.shape[:2]
+        if len(self.lights) < FFT_MIN_LIGHTS:
+            return self.lights
+        groups = {}
+        for light in self.lights:
+            groups.setdefault((light[2], tuple(light[3:])), []).append(light)
+        remaining = []
+        for (radius, color), group in groups.items():
+            size = 2 * radius
+            if len(group) * size * size < FFT_LIGHT_COVERAGE * width * height:
+                remaining.extend(group)
+                continue
+            # Impulse at each centre, in a frame padded so partly visible lights still count
+            centers = np.array([(int(y) + radius, int(x) + radius) for x, y, *_ in group])
+            visible = (centers > 0).all(axis=1) & (centers[:, 0] < height + size) & (centers[:, 1] < width + size)
+            impulses = np.zeros((height + size, width + size))
+            np.add.at(impulses, tuple(centers[visible].T), 1)
+            shape = (_fft_length(height + 2 * size - 1), _fft_length(width + 2 * size - 1))
+            spectrum = np.fft.rfft2(impulses, shape)
+            kernels = self._kernel_spectra.get((radius, color))
+            if kernels is not None:
+                self._kernel_spectra.move_to_end((radius, color))
+            else:
+                gradient = self._light_gradient(radius, color)
+                kernels = tuple(np.fft.rfft2(k, shape) for k in (gradient[..., :3].any(axis=2), gradient[..., 3]))
+                self._kernel_spectra[(radius, color)] = kernels
+                if len(self._kernel_spectra) > KERNEL_SPECTRA_CACHE_SIZE:
+                    self._kernel_spectra.popitem(last=False)
+            counts, alpha = (
+                np.rint(np.fft.irfft2(spectrum * kernel, shape)[size:size + height, size:size + width])
+                for kernel in kernels
+            )
+            # Everything is clamped to 255 at the end anyway, so clamp before narrowing
+            for channel, value in enumerate(color):
+                accum[..., channel] += np.minimum(counts * value, 255).astype(np.uint16)
+            accum[..., 3] += np.minimum(alpha, 255).astype(np.uint16)
+            np.minimum(accum, 255, out=accum)
+        return remaining
+
+    def _write_mask(self, accum):
+        """Copy the clamped sums into the mask's pixel buffer, one byte plane per channel."""
+        height, width = accum.shape[:2]
+        pixels = np.frombuffer(self.light_mask.get_buffer(), dtype=np.uint8)
+        pixels = pixels.reshape(height, -1)[:, :width * 4].reshape(height, width, 4)
+        for channel, shift in enumerate(self.light_mask.get_shifts()):
+            pixels[..., shift // 8] = accum[..., channel]
 
     def add_light(self, pos, radius, color=(255, 200, 100)):
-        light_surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
-        for r in range(radius, 0, -2):
-            alpha = int(150 * (1 - r / radius))
-            pygame.draw.circle(light_surf, (*color, alpha), (radius, radius), r)
-        self.light_mask.blit(light_surf, (pos[0] - radius, pos[1] - radius), special_flags=pygame.BLEND_RGBA_ADD)
+        self.lights.append((pos[0], pos[1], radius, *color[:3]))
+        self._mask_dirty = True
 
     def get_mask(self):
+        """Rasterize the lights into the mask, only when a CPU backend asks for it."""
+        if self._mask_dirty:
+            accum = self._accum
+            # One 64-bit store per pixel instead of a broadcast over the 4 channels
+            accum.view(np.uint64).fill(np.array(pygame.Color(*self.ambient), dtype=np.uint16).view(np.uint64)[0])
+            height, width = accum.shape[:2]
+            lights = self._convolve_dense_groups(accum)
+            clamp_each = len(lights) > ACCUM_HEADROOM
+            for x, y, radius, *color in lights:
+                gradient = self._light_gradient(radius, color)
+                left, top = int(x) - radius, int(y) - radius
+                x0, y0 = max(left, 0), max(top, 0)
+                x1, y1 = min(left + 2 * radius, width), min(top + 2 * radius, height)
+                if x0 < x1 and y0 < y1:
+                    region = accum[y0:y1, x0:x1]
+                    region += gradient[y0 - top:y1 - top, x0 - left:x1 - left]
+                    if clamp_each:
+                        np.minimum(region, 255, out=region)
+            # Clamping once at the end matches pygame's per-blit saturating add
+            np.minimum(accum, 255, out=accum)
+            self._write_mask(accum)
+            self._mask_dirty = False
         return self.light_mask
@@ -1,4 +1,5 @@
 # engine/scripting/lua_bridge.py
+import os
 import lupa
 from lupa import LuaRuntime
 
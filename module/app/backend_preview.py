@@ -0,0 +1,46 @@
+import sys
+
+import pygame
+
+def run_preview(backend="opengl"):
+    """Open a standalone window cleared by the given backend until the user closes it."""
+    pygame.init()
+    ctx = None
+
+    if backend == "opengl":
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
+        pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
+        pygame.display.set_mode((960, 540), pygame.DOUBLEBUF | pygame.OPENGL)
+        try:
+            import moderngl
+            ctx = moderngl.create_context()
+        except Exception:
+            ctx = None
+    if ctx is None:
+        # Software fills only: a plain SDL window, not a GL surface they get copied into
+        pygame.display.set_mode((960, 540), pygame.DOUBLEBUF)
+
+    pygame.display.set_caption(f"NeoPyxel {backend.upper()} Preview")
+    clock = pygame.time.Clock()
+    running = True
+
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+        if ctx:
+            ctx.clear(0.07, 0.09, 0.13)
+            pygame.display.flip()
+        else:
+            surf = pygame.display.get_surface()
+            if surf:
+                surf.fill((18, 24, 34))
+                pygame.display.flip()
+        clock.tick(60)
+
+    pygame.quit()
+
+if __name__ == "__main__":
+    run_preview(sys.argv[1] if len(sys.argv) > 1 else "opengl")
@@ -1,11 +1,14 @@
-import json
+import functools
+import multiprocessing
 import os
 import shutil
 import subprocess
 import sys
+from collections import deque
+from pathlib import Path
 
 import pygame
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QFileSystemWatcher, QSettings, QSignalBlocker, Qt, QTimer
 from PyQt5.QtWidgets import (
     QAction,
     QActionGroup,
@@ -30,19 +33,98 @@ from PyQt5.QtWidgets import (
 )
 
 from editor.editorscript_bridge import ScriptBridge
+from module.app import backend_preview
 from module.app.plugin_manager import PluginManager
+from module.app.project_io import SceneSaver, read_json, write_json
 from module.constants import APP_VERSION, IMAGE_EXTENSIONS, MODEL_EXTENSIONS
-from module.render.playable_exporter import build_playable_script
+from module.render.playable_exporter import build_playable_script, pack_sprite_atlas
 from module.widget.PygameWidget.pygame_widget import PygameWidget
 from module.widget.Scene.scene3d_widget import Scene3DWidget
 from module.widget.asset_list_widget import AssetListWidget
 
+DARK_THEME_QSS = """
+    QMainWindow { background-color: #11151e; color: #d6dae3; }
+    QMenuBar { background-color: #151b25; color: #d6dae3; padding: 4px; }
+    QMenuBar::item:selected { background: #283244; }
+    QMenu { background-color: #151b25; color: #d6dae3; border: 1px solid #2a3446; }
+    QMenu::item:selected { background-color: #283244; }
+    QMessageBox {
+        background-color: #121924;
+    }
+    QMessageBox QLabel {
+        color: #e8f1ff;
+        font-size: 12px;
+    }
+    QDockWidget { color: #d6dae3; border: 1px solid #222c3d; titlebar-close-icon: none; }
+    QDockWidget::title { background: #171f2c; padding: 6px; text-align: left; }
+    QListWidget, QTextEdit, QComboBox, QSpinBox {
+        background-color: #121924;
+        color: #cfd8e6;
+        border: 1px solid #2b384e;
+        selection-background-color: #28405d;
+    }
+    QPushButton {
+        background-color: #1f2d40;
+        color: #dbe7ff;
+        border: 1px solid #35506f;
+        border-radius: 4px;
+        padding: 6px;
+    }
+    QPushButton:hover { background-color: #2b3d55; }
+    QLabel { color: #b9c8df; }
+    QCheckBox { color: #cfd8e6; spacing: 6px; }
+    QStatusBar { background-color: #141b27; color: #9fb7d7; }
+"""
+
+# Only the Backend menu uses indicators; its own sheet keeps these rules out of
+# the selector matching for every other widget in the window.
+BACKEND_MENU_QSS = """
+    QMenu::indicator {
+        width: 10px;
+        height: 10px;
+        border-radius: 5px;
+        margin-left: 6px;
+        image: none;
+    }
+    QMenu::indicator:unchecked {
+        border: 1px solid #4a5d7a;
+        background: transparent;
+    }
+    QMenu::indicator:checked {
+        border: 1px solid #75a7ff;
+        background: #75a7ff;
+    }
+"""
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # holds module/
+FORBIDDEN_NAME_CHARS = str.maketrans("", "", '<>:"/\\|?*')  # not allowed in Windows file names
+OUTPUT_MAX_LINES = 1000  # the Output dock keeps only the newest status lines
+
+def _sanitize_name(name):
+    return name.translate(FORBIDDEN_NAME_CHARS)
+
+@functools.lru_cache(maxsize=1)
+def _preview_context():
+    """forkserver context with pygame preloaded, or None where it is unavailable (Windows, frozen builds)."""
+    if getattr(sys, "frozen", False) or "forkserver" not in multiprocessing.get_all_start_methods():
+        return None
+    # A plain fork would copy the editor's Qt/SDL state and its worker threads; the
+    # fork server is a clean interpreter started on the first preview and reused after.
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(["pygame", backend_preview.__name__])
+    return ctx
+
+def _preview_running(proc):
+    if hasattr(proc, "poll"):
+        return proc.poll() is None
+    return proc.is_alive()
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"NeoPyxel Studio - v{APP_VERSION}")
-        self.setGeometry(100, 100, 1500, 880)
-        self.showMaximized()
+        self.setGeometry(100, 100, 1500, 880)  # restored size; the window opens maximized in showEvent
+        self._shown_once = False
 
         self.current_project_dir = None
         self.current_project_name = None
@@ -53,81 +135,46 @@ class MainWindow(QMainWindow):
         self.backend_preview_processes = []
         self.plugin_docks = []
         self.view_menu = None
-
-        pygame.init()
-        self.engine_widget = PygameWidget(backend_type="pygame")
-        self.engine_widget.on_world_changed = self.refresh_entity_list
-        self.engine_widget.on_selection_changed = self.on_viewport_selection_changed
-        self.engine_widget.on_message = self.set_status
+        # Assets, Inspector and Output build their contents the first time they are shown
+        self.asset_list = None
+        self._asset_scan = None  # (assets_dir, {directory: mtime_ns}) behind the current asset list
+        self._asset_items = {}  # abs path -> its QListWidgetItem
+        self.asset_watcher = QFileSystemWatcher(self)
+        self.asset_watcher.directoryChanged.connect(self._on_asset_dir_changed)
+        self.sprite_label = None
+        self._inspector_sig = None  # (row, values, sprite) the inspector currently shows, unedited
+        self.output_log = None
+        self._pending_output = deque(maxlen=OUTPUT_MAX_LINES)  # status lines logged before the Output dock exists
+        self._listed_scene = None  # scene rows the entity list was last built from
+        self.settings = QSettings("NeoPyxel", "Studio")  # editor preferences, not part of any project
+        # Grid/snap/lighting changes made in one event-loop pass reach the viewport once
+        self._grid_update_timer = QTimer(self)
+        self._grid_update_timer.setSingleShot(True)
+        self._grid_update_timer.setInterval(0)
+        self._grid_update_timer.timeout.connect(self._apply_grid_settings)
+
+        # pygame and the 2D viewport are brought up by ensure_engine_visible on first use
+        self.engine_widget = None
         self.scene3d_widget = Scene3DWidget()
         self.scene3d_widget.on_message = self.set_status
         self.viewport_stack = QStackedWidget()
-        self.viewport_stack.addWidget(self.engine_widget)
         self.viewport_stack.addWidget(self.scene3d_widget)
         self.setCentralWidget(self.viewport_stack)
 
         self.apply_dark_theme()
         self.create_docks()
         self.create_menu_bar()
+        self.scene_saver = SceneSaver(self)
+        self.scene_saver.saveFinished.connect(self.on_scene_saved)
         self.script_bridge = ScriptBridge()
         self.plugin_manager = PluginManager(self)
         self.plugin_manager.load_plugins(self.get_runtime_base_dir())
         self.plugin_manager.emit("on_app_start", self)
-        self.on_grid_settings_changed()
         self.activate_3d_workspace()
         self.set_status("No project loaded. Use File > New or File > Open.")
 
     def apply_dark_theme(self):
-        self.setStyleSheet(
-            """
-            QMainWindow { background-color: #11151e; color: #d6dae3; }
-            QMenuBar { background-color: #151b25; color: #d6dae3; padding: 4px; }
-            QMenuBar::item:selected { background: #283244; }
-            QMenu { background-color: #151b25; color: #d6dae3; border: 1px solid #2a3446; }
-            QMenu::item:selected { background-color: #283244; }
-            QMenu#backend_menu::indicator {
-                width: 10px;
-                height: 10px;
-                border-radius: 5px;
-                margin-left: 6px;
-                image: none;
-            }
-            QMenu#backend_menu::indicator:unchecked {
-                border: 1px solid #4a5d7a;
-                background: transparent;
-            }
-            QMenu#backend_menu::indicator:checked {
-                border: 1px solid #75a7ff;
-                background: #75a7ff;
-            }
-            QMessageBox {
-                background-color: #121924;
-            }
-            QMessageBox QLabel {
-                color: #e8f1ff;
-                font-size: 12px;
-            }
-            QDockWidget { color: #d6dae3; border: 1px solid #222c3d; titlebar-close-icon: none; }
-            QDockWidget::title { background: #171f2c; padding: 6px; text-align: left; }
-            QListWidget, QTextEdit, QComboBox, QSpinBox {
-                background-color: #121924;
-                color: #cfd8e6;
-                border: 1px solid #2b384e;
-                selection-background-color: #28405d;
-            }
-            QPushButton {
-                background-color: #1f2d40;
-                color: #dbe7ff;
-                border: 1px solid #35506f;
-                border-radius: 4px;
-                padding: 6px;
-            }
-            QPushButton:hover { background-color: #2b3d55; }
-            QLabel { color: #b9c8df; }
-            QCheckBox { color: #cfd8e6; spacing: 6px; }
-            QStatusBar { background-color: #141b27; color: #9fb7d7; }
-            """
-        )
+        self.setStyleSheet(DARK_THEME_QSS)
 
     def create_menu_bar(self):
         menubar = self.menuBar()
@@ -207,9 +254,11 @@ class MainWindow(QMainWindow):
         tools_menu = menubar.addMenu("Tools")
         draw_group = QActionGroup(self)
         draw_group.setExclusive(True)
+        # One connection per group; each action carries its tool/backend name as data
+        draw_group.triggered.connect(self._on_draw_tool_action)
         for tool in ["Select", "Pen", "Line", "Rect", "Eraser"]:
             act = QAction(tool, self, checkable=True)
-            act.triggered.connect(lambda checked, t=tool: self.set_draw_tool(t))
+            act.setData(tool)
             if tool == "Select":
                 act.setChecked(True)
             draw_group.addAction(act)
@@ -217,13 +266,15 @@ class MainWindow(QMainWindow):
 
         backend_menu = menubar.addMenu("Backend")
         backend_menu.setObjectName("backend_menu")
+        backend_menu.setStyleSheet(BACKEND_MENU_QSS)
         self.backend_actions = {}
         backend_group = QActionGroup(self)
-        backend_group.setExclusive(True)
+        backend_group.setExclusive(True)  # checking one backend action unchecks the others
+        backend_group.triggered.connect(self._on_backend_action)
         for backend in ["pygame", "opengl", "vulkan"]:
             act = QAction(backend.upper(), self, checkable=True)
-            act.setChecked(backend == self.engine_widget.backend_type)
-            act.triggered.connect(lambda checked, b=backend: self.switch_backend(b))
+            act.setChecked(backend == "pygame")
+            act.setData(backend)
             self.backend_actions[backend] = act
             backend_group.addAction(act)
             backend_menu.addAction(act)
@@ -233,6 +284,12 @@ class MainWindow(QMainWindow):
         about_act.triggered.connect(self.show_about)
         help_menu.addAction(about_act)
 
+    def _on_draw_tool_action(self, action):
+        self.set_draw_tool(action.data())
+
+    def _on_backend_action(self, action):
+        self.switch_backend(action.data())
+
     def _rebuild_view_menu(self):
         if not self.view_menu:
             return
@@ -266,6 +323,28 @@ class MainWindow(QMainWindow):
         self._rebuild_view_menu()
 
     def create_docks(self):
+        self._build_scene_dock()
+        left_or_right = Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea
+        self.assets_dock = self._lazy_dock("Assets", left_or_right, Qt.LeftDockWidgetArea, self._ensure_assets_built)
+        self.inspector_dock = self._lazy_dock(
+            "Inspector", left_or_right, Qt.RightDockWidgetArea, self._ensure_inspector_built
+        )
+        self.output_dock = self._lazy_dock(
+            "Output", Qt.BottomDockWidgetArea, Qt.BottomDockWidgetArea, self._ensure_output_built
+        )
+        self._rebuild_view_menu()
+
+    def _lazy_dock(self, title, allowed_areas, area, ensure_built):
+        """Dock holding an empty placeholder until it first becomes visible."""
+        dock = QDockWidget(title, self)
+        dock.setAllowedAreas(allowed_areas)
+        dock.setWidget(QWidget())
+        # Built on the next event-loop pass, so the window paints once before the dock contents exist
+        dock.visibilityChanged.connect(lambda visible: QTimer.singleShot(0, ensure_built) if visible else None)
+        self.addDockWidget(area, dock)
+        return dock
+
+    def _build_scene_dock(self):
         self.scene_dock = QDockWidget("Scene Graph", self)
         self.scene_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
         scene_widget = QWidget()
@@ -281,21 +360,21 @@ class MainWindow(QMainWindow):
 
         scene_layout.addWidget(QLabel("Grid / Snap"))
         self.show_grid_checkbox = QCheckBox("Show Grid")
-        self.show_grid_checkbox.setChecked(True)
+        self.show_grid_checkbox.setChecked(self.settings.value("grid/show_grid", True, type=bool))
         self.show_grid_checkbox.toggled.connect(self.on_grid_settings_changed)
         scene_layout.addWidget(self.show_grid_checkbox)
 
         self.snap_checkbox = QCheckBox("Snap To Grid")
-        self.snap_checkbox.setChecked(True)
+        self.snap_checkbox.setChecked(self.settings.value("grid/snap_enabled", True, type=bool))
         self.snap_checkbox.toggled.connect(self.on_grid_settings_changed)
         scene_layout.addWidget(self.snap_checkbox)
 
         self.lighting_checkbox = QCheckBox("Editor Lighting")
-        self.lighting_checkbox.setChecked(False)
+        self.lighting_checkbox.setChecked(self.settings.value("grid/editor_lighting", False, type=bool))
         self.lighting_checkbox.toggled.connect(self.on_grid_settings_changed)
         scene_layout.addWidget(self.lighting_checkbox)
 
-        self.grid_size_spin = self._make_spin(4, 128, 16)
+        self.grid_size_spin = self._make_spin(4, 128, self.settings.value("grid/grid_size", 16, type=int))
         self.grid_size_spin.setSingleStep(4)
         self.grid_size_spin.valueChanged.connect(self.on_grid_settings_changed)
         scene_layout.addWidget(QLabel("Grid Size"))
@@ -317,8 +396,9 @@ class MainWindow(QMainWindow):
         self.scene_dock.setWidget(scene_widget)
         self.addDockWidget(Qt.LeftDockWidgetArea, self.scene_dock)
 
-        self.assets_dock = QDockWidget("Assets", self)
-        self.assets_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+    def _ensure_assets_built(self):
+        if self.asset_list is not None:
+            return
         assets_widget = QWidget()
         assets_layout = QVBoxLayout(assets_widget)
         self.assets_path_label = QLabel("assets: -")
@@ -329,10 +409,11 @@ class MainWindow(QMainWindow):
         self.asset_list.itemDoubleClicked.connect(self.insert_selected_asset_to_viewport)
         assets_layout.addWidget(self.asset_list)
         self.assets_dock.setWidget(assets_widget)
-        self.addDockWidget(Qt.LeftDockWidgetArea, self.assets_dock)
+        self.refresh_asset_browser()
 
-        self.inspector_dock = QDockWidget("Inspector", self)
-        self.inspector_dock.setAllowedAreas(Qt.LeftDockWidgetArea | Qt.RightDockWidgetArea)
+    def _ensure_inspector_built(self):
+        if self.sprite_label is not None:
+            return
         inspector_widget = QWidget()
         inspector_layout = QFormLayout(inspector_widget)
 
@@ -344,6 +425,18 @@ class MainWindow(QMainWindow):
         self.color_g_spin = self._make_spin(0, 255, 255)
         self.color_b_spin = self._make_spin(0, 255, 0)
         self.sprite_label = QLabel("(none)")
+        # x, y, w, h, r, g, b: read and written together
+        self._inspector_spins = (
+            self.pos_x_spin,
+            self.pos_y_spin,
+            self.width_spin,
+            self.height_spin,
+            self.color_r_spin,
+            self.color_g_spin,
+            self.color_b_spin,
+        )
+        for spin in self._inspector_spins:
+            spin.valueChanged.connect(self._on_inspector_edited)
 
         inspector_layout.addRow("X", self.pos_x_spin)
         inspector_layout.addRow("Y", self.pos_y_spin)
@@ -359,15 +452,18 @@ class MainWindow(QMainWindow):
         inspector_layout.addRow(apply_btn)
 
         self.inspector_dock.setWidget(inspector_widget)
-        self.addDockWidget(Qt.RightDockWidgetArea, self.inspector_dock)
+        self.populate_inspector(self.entity_list.currentRow())
 
-        self.output_dock = QDockWidget("Output", self)
-        self.output_dock.setAllowedAreas(Qt.BottomDockWidgetArea)
+    def _ensure_output_built(self):
+        if self.output_log is not None:
+            return
         self.output_log = QTextEdit()
         self.output_log.setReadOnly(True)
+        self.output_log.document().setMaximumBlockCount(OUTPUT_MAX_LINES)
+        if self._pending_output:
+            self.output_log.append("\n".join(self._pending_output))
+            self._pending_output.clear()
         self.output_dock.setWidget(self.output_log)
-        self.addDockWidget(Qt.BottomDockWidgetArea, self.output_dock)
-        self._rebuild_view_menu()
 
     def _make_spin(self, min_value, max_value, value=0):
         spin = QSpinBox()
@@ -377,10 +473,21 @@ class MainWindow(QMainWindow):
 
     def set_status(self, message):
         self.statusBar().showMessage(message, 6000)
-        if hasattr(self, "output_log"):
+        if self.output_log is not None:
             self.output_log.append(message)
+        else:
+            self._pending_output.append(message)
 
     def on_grid_settings_changed(self):
+        self._grid_update_timer.start()
+
+    def _apply_grid_settings(self):
+        self.settings.setValue("grid/snap_enabled", self.snap_checkbox.isChecked())
+        self.settings.setValue("grid/show_grid", self.show_grid_checkbox.isChecked())
+        self.settings.setValue("grid/editor_lighting", self.lighting_checkbox.isChecked())
+        self.settings.setValue("grid/grid_size", self.grid_size_spin.value())
+        if self.engine_widget is None:
+            return  # applied when the viewport is created
         self.engine_widget.set_grid_settings(
             self.snap_checkbox.isChecked(),
             self.show_grid_checkbox.isChecked(),
@@ -389,7 +496,6 @@ class MainWindow(QMainWindow):
         self.engine_widget.set_editor_lighting(self.lighting_checkbox.isChecked())
 
     def activate_2d_workspace(self):
-        self.viewport_stack.setCurrentWidget(self.engine_widget)
         self.ensure_engine_visible()
         self.set_status("2D workspace active")
 
@@ -420,12 +526,10 @@ class MainWindow(QMainWindow):
                 self.set_status(
                     f"{backend.upper()} preview launched in separate window. Editor viewport remains PYGAME for stability."
                 )
-                for name, action in self.backend_actions.items():
-                    action.setChecked(name == backend)
+                self.backend_actions[backend].setChecked(True)
             else:
                 self.set_status(f"Failed to launch {backend.upper()} preview.")
-                for name, action in self.backend_actions.items():
-                    action.setChecked(name == "pygame")
+                self.backend_actions["pygame"].setChecked(True)
             return
 
         # PYGAME editor viewport should not restart pygame every click.
@@ -441,59 +545,27 @@ class MainWindow(QMainWindow):
         self.engine_widget.needs_redraw = True
         self.engine_widget.update()
         self.set_status("Pygame viewport active")
-        for name, action in self.backend_actions.items():
-            action.setChecked(name == "pygame")
+        self.backend_actions["pygame"].setChecked(True)
 
     def launch_backend_preview(self, backend):
-        script = r'''
-import sys
-import pygame
-
-backend = sys.argv[1] if len(sys.argv) > 1 else "opengl"
-pygame.init()
-
-if backend == "opengl":
-    pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MAJOR_VERSION, 3)
-    pygame.display.gl_set_attribute(pygame.GL_CONTEXT_MINOR_VERSION, 3)
-    pygame.display.gl_set_attribute(pygame.GL_CONTEXT_PROFILE_MASK, pygame.GL_CONTEXT_PROFILE_CORE)
-    pygame.display.set_mode((960, 540), pygame.DOUBLEBUF | pygame.OPENGL)
-    try:
-        import moderngl
-        ctx = moderngl.create_context()
-    except Exception:
-        ctx = None
-else:
-    pygame.display.set_mode((960, 540))
-    ctx = None
-
-pygame.display.set_caption(f"NeoPyxel {backend.upper()} Preview")
-clock = pygame.time.Clock()
-running = True
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    if ctx:
-        ctx.clear(0.07, 0.09, 0.13)
-        pygame.display.flip()
-    else:
-        surf = pygame.display.get_surface()
-        if surf:
-            surf.fill((18, 24, 34))
-            pygame.display.flip()
-    clock.tick(60)
-
-pygame.quit()
-'''
         self._close_backend_previews()
         try:
-            proc = subprocess.Popen(
-                [sys.executable, "-c", script, backend],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+            ctx = _preview_context()
+            if ctx is not None:
+                # Forked from an interpreter that already imported pygame, so no cold start
+                proc = ctx.Process(target=backend_preview.run_preview, args=(backend,), daemon=True)
+                proc.start()
+            else:
+                # -m goes through the import system, so the module's cached .pyc is reused;
+                # running the file as a script would recompile it on every launch
+                env = dict(os.environ)
+                env["PYTHONPATH"] = os.pathsep.join(filter(None, (PACKAGE_ROOT, env.get("PYTHONPATH"))))
+                proc = subprocess.Popen(
+                    [sys.executable, "-m", backend_preview.__name__, backend],
+                    env=env,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
             self.backend_preview_processes.append(proc)
             return True
         except Exception:
@@ -503,12 +575,12 @@ pygame.quit()
         alive = []
         for proc in self.backend_preview_processes:
             try:
-                if proc.poll() is None:
+                if _preview_running(proc):
                     proc.terminate()
             except Exception:
                 pass
             else:
-                if proc.poll() is None:
+                if _preview_running(proc):
                     alive.append(proc)
         self.backend_preview_processes = alive
 
@@ -518,7 +590,7 @@ pygame.quit()
             self.set_status("New project canceled")
             return
 
-        safe_name = "".join(ch for ch in project_name.strip() if ch not in '<>:"/\\|?*').strip()
+        safe_name = _sanitize_name(project_name.strip()).strip()
         if not safe_name:
             self.set_status("Invalid project name")
             return
@@ -561,7 +633,9 @@ pygame.quit()
             return
 
         metadata_path = os.path.join(selected, self.current_metadata_file)
-        if not os.path.exists(metadata_path):
+        try:
+            metadata = read_json(metadata_path)
+        except FileNotFoundError:
             QMessageBox.warning(
                 self,
                 "Invalid Project Folder",
@@ -569,14 +643,15 @@ pygame.quit()
             )
             self.set_status(f"Open failed: {self.current_metadata_file} not found")
             return
+        except Exception as exc:
+            self._warn_invalid_metadata(exc)
+            return
 
         self.current_project_dir = selected
         self.current_project_name = os.path.basename(selected)
         self.ensure_project_structure()
 
         try:
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
             self.current_project_name = metadata.get("name", self.current_project_name)
             self.main_scene_name = metadata.get("main_scene", "main.json")
             self.current_scene_name = metadata.get("last_scene", self.main_scene_name)
@@ -584,13 +659,17 @@ pygame.quit()
             if self.main_scene_name not in self.scene_files:
                 self.scene_files.insert(0, self.main_scene_name)
             backend_name = str(metadata.get("backend", "pygame")).lower()
-            self.snap_checkbox.setChecked(bool(metadata.get("snap_enabled", True)))
-            self.show_grid_checkbox.setChecked(bool(metadata.get("show_grid", True)))
-            self.lighting_checkbox.setChecked(bool(metadata.get("editor_lighting", False)))
-            self.grid_size_spin.setValue(int(metadata.get("grid_size", 16)))
+            # Grid preferences live in QSettings now; project files written before that still carry them
+            if "snap_enabled" in metadata:
+                self.snap_checkbox.setChecked(bool(metadata["snap_enabled"]))
+            if "show_grid" in metadata:
+                self.show_grid_checkbox.setChecked(bool(metadata["show_grid"]))
+            if "editor_lighting" in metadata:
+                self.lighting_checkbox.setChecked(bool(metadata["editor_lighting"]))
+            if "grid_size" in metadata:
+                self.grid_size_spin.setValue(int(metadata["grid_size"]))
         except Exception as exc:
-            QMessageBox.warning(self, "Invalid Project Metadata", f"Failed to read {self.current_metadata_file}:\n{exc}")
-            self.set_status(f"Open failed: invalid {self.current_metadata_file}")
+            self._warn_invalid_metadata(exc)
             return
 
         self.ensure_engine_visible()
@@ -678,11 +757,10 @@ pygame.quit()
                 self.set_status(f"Import failed: {base_name} ({exc})")
                 continue
 
-            rel_model = os.path.relpath(target, assets_dir).replace("\\", "/")
+            rel_model = f"models/{os.path.basename(target)}"
             self.scene3d_widget.add_model_asset(rel_model, target)
             imported += 1
 
-        self.refresh_asset_browser()
         if imported:
             self.activate_3d_workspace()
             self.set_status(f"Imported {imported} model(s) into assets/models")
@@ -697,14 +775,9 @@ pygame.quit()
             "main_scene": self.main_scene_name,
             "last_scene": self.current_scene_name,
             "scenes": self.scene_files,
-            "snap_enabled": self.snap_checkbox.isChecked(),
-            "show_grid": self.show_grid_checkbox.isChecked(),
-            "editor_lighting": self.lighting_checkbox.isChecked(),
-            "grid_size": self.grid_size_spin.value(),
         }
         path = os.path.join(self.current_project_dir, self.current_metadata_file)
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        write_json(path, metadata)
 
     def save_current_scene_file(self):
         scenes_dir = self.scenes_dir_for_current_project()
@@ -720,22 +793,34 @@ pygame.quit()
             "entities2d": scene_2d,
             "entities3d": scene_3d,
         }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
+        # Written off the GUI thread; loads wait for it through scene_saver.wait()
+        self.scene_saver.save(path, payload)
+
+    def on_scene_saved(self, path, error):
+        if error:
+            self.set_status(f"Failed to save scene {os.path.basename(path)}: {error}")
+
+    def _warn_invalid_metadata(self, exc):
+        QMessageBox.warning(self, "Invalid Project Metadata", f"Failed to read {self.current_metadata_file}:\n{exc}")
+        self.set_status(f"Open failed: invalid {self.current_metadata_file}")
 
     def load_scene_file(self, scene_name):
         if not self.current_project_dir:
             return
+        self.scene_saver.wait()
         path = os.path.join(self.scenes_dir_for_current_project(), scene_name)
-        if not os.path.exists(path):
+        try:
+            payload = read_json(path)
+        except FileNotFoundError:
             self.engine_widget.clear_scene()
             self.scene3d_widget.reset_scene()
             self.current_scene_name = scene_name
             return
+        except Exception as exc:
+            self.set_status(f"Failed to load scene {scene_name}: {exc}")
+            return
 
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                payload = json.load(f)
             entities_2d = payload.get("entities2d", payload.get("entities", []))
             entities_3d = payload.get("entities3d", [])
             scene_mode = str(payload.get("mode", "2d")).lower()
@@ -759,7 +844,7 @@ pygame.quit()
         name, ok = QInputDialog.getText(self, "New Scene", "Scene file name (without .json):")
         if not ok or not name.strip():
             return
-        base = "".join(ch for ch in name.strip() if ch not in '<>:"/\\|?*')
+        base = _sanitize_name(name.strip())
         if not base:
             self.set_status("Invalid scene name")
             return
@@ -799,90 +884,197 @@ pygame.quit()
         self.save_project_metadata()
 
     def refresh_scene_selector(self):
-        self.scene_selector.blockSignals(True)
-        self.scene_selector.clear()
-        for scene in self.scene_files:
-            self.scene_selector.addItem(scene)
-        idx = self.scene_selector.findText(self.current_scene_name)
-        if idx >= 0:
-            self.scene_selector.setCurrentIndex(idx)
-        self.scene_selector.blockSignals(False)
+        with QSignalBlocker(self.scene_selector):
+            self.scene_selector.clear()
+            self.scene_selector.addItems(self.scene_files)
+            idx = self.scene_selector.findText(self.current_scene_name)
+            if idx >= 0:
+                self.scene_selector.setCurrentIndex(idx)
         self.main_scene_label.setText(f"Main Scene: {self.main_scene_name}")
 
     def refresh_asset_browser(self):
-        self.asset_list.clear()
+        if self.asset_list is None:
+            return  # filled when the Assets dock is first shown
         assets_dir = self.assets_dir_for_current_project()
         self.assets_path_label.setText(f"assets: {assets_dir}")
 
         if not assets_dir or not os.path.exists(assets_dir):
+            self._set_asset_scan(None)
+            self._asset_items = {}
+            self.asset_list.clear()
+            return
+        if self._assets_unchanged(assets_dir):
             return
 
-        for root, _, files in os.walk(assets_dir):
-            for filename in files:
-                if not filename.lower().endswith(IMAGE_EXTENSIONS):
-                    continue
-                abs_path = os.path.join(root, filename)
-                rel_path = os.path.relpath(abs_path, assets_dir).replace("\\", "/")
+        found, dir_mtimes = self._scan_assets(assets_dir)
+        self._set_asset_scan((assets_dir, dir_mtimes))
+        self.asset_list.clear()
+        self.asset_list.addItems([rel_path for rel_path, _ in found])
+        self._asset_items = {}
+        for row, (_, abs_path) in enumerate(found):
+            item = self.asset_list.item(row)
+            item.setData(Qt.UserRole, abs_path)
+            self._asset_items[abs_path] = item
+
+    def _set_asset_scan(self, scan):
+        """Record the scan behind the asset list and watch exactly the directories it read."""
+        self._asset_scan = scan
+        watched = set(self.asset_watcher.directories())
+        wanted = set(scan[1]) if scan else set()
+        if watched - wanted:
+            self.asset_watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self.asset_watcher.addPaths(list(wanted - watched))
+
+    def _on_asset_dir_changed(self, directory):
+        """Rescan only the folder the watcher reported and apply the difference to the list."""
+        if self.asset_list is None or not self._asset_scan:
+            return
+        assets_dir, dir_mtimes = self._asset_scan
+        if directory not in dir_mtimes:
+            return
+        prefix = os.path.join(directory, "")
+        dir_mtimes = {
+            path: mtime for path, mtime in dir_mtimes.items() if path != directory and not path.startswith(prefix)
+        }
+        found = []
+        if os.path.isdir(directory):
+            found, scanned = self._scan_assets(assets_dir, directory)
+            dir_mtimes.update(scanned)
+        self._set_asset_scan((assets_dir, dir_mtimes))
+
+        current = {abs_path: rel_path for rel_path, abs_path in found}
+        for abs_path in [path for path in self._asset_items if path.startswith(prefix) and path not in current]:
+            self.asset_list.takeItem(self.asset_list.row(self._asset_items.pop(abs_path)))
+        added = False
+        for abs_path, rel_path in current.items():
+            if abs_path not in self._asset_items:
                 item = QListWidgetItem(rel_path)
                 item.setData(Qt.UserRole, abs_path)
                 self.asset_list.addItem(item)
+                self._asset_items[abs_path] = item
+                added = True
+        if added:
+            self.asset_list.sortItems()
+
+    def _assets_unchanged(self, assets_dir):
+        """True when no directory of the last scan was modified; adding or removing an entry bumps its mtime."""
+        if not self._asset_scan or self._asset_scan[0] != assets_dir:
+            return False
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in self._asset_scan[1].items())
+        except OSError:
+            return False
+
+    @staticmethod
+    def _scan_assets(assets_dir, start=None):
+        """Sorted (rel_path, abs_path) for every image under start (default assets_dir), and the mtime of each directory read."""
+        prefix_len = len(os.path.join(assets_dir, ""))
+        found = []
+        dir_mtimes = {}
+        pending = [start or assets_dir]
+        while pending:
+            directory = pending.pop()
+            try:
+                # stat before listing, so a change made during the scan still shows up next time
+                dir_mtimes[directory] = os.stat(directory).st_mtime_ns
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                            found.append((entry.path[prefix_len:].replace(os.sep, "/"), entry.path))
+            except OSError:
+                continue
+        found.sort()
+        return found, dir_mtimes
 
     def insert_selected_asset_to_viewport(self, item):
         if not item:
             return
-        abs_path = item.data(Qt.UserRole)
-        rel = os.path.relpath(abs_path, self.assets_dir_for_current_project()).replace("\\", "/")
+        rel = item.text()  # the asset scan lists paths relative to the assets folder, with "/"
         self.ensure_engine_visible()
         self.engine_widget.add_sprite_entity(100, 100, rel)
         self.set_status(f"Asset inserted: {rel}")
 
     def refresh_entity_list(self, scene_data):
-        self.entity_list.blockSignals(True)
-        self.entity_list.clear()
-        for i, entity in enumerate(scene_data):
-            sprite = entity.get("sprite")
-            kind = f"Sprite:{sprite}" if sprite else "Rect"
-            text = f"{i} | {kind} | ({entity['x']},{entity['y']}) {entity['w']}x{entity['h']}"
-            self.entity_list.addItem(QListWidgetItem(text))
-        self.entity_list.blockSignals(False)
+        # The viewport hands out a new rows list whenever something changed
+        if scene_data is self._listed_scene:
+            return
+        old = self._listed_scene or []
+        self._listed_scene = scene_data
+        # Untouched entities keep their row dict, so a row whose dict is the same object
+        # at the same index already shows the right text
+        start = 0
+        common = min(len(old), len(scene_data))
+        while start < common and old[start] is scene_data[start]:
+            start += 1
+        text = self._entity_row_text
+
+        with QSignalBlocker(self.entity_list):
+            self.entity_list.setUpdatesEnabled(False)
+            try:
+                if start == 0:
+                    self.entity_list.clear()
+                    self.entity_list.addItems([text(row, entity) for row, entity in enumerate(scene_data)])
+                else:
+                    for row in range(start, common):
+                        if old[row] is not scene_data[row]:
+                            self.entity_list.item(row).setText(text(row, scene_data[row]))
+                    for row in range(len(old) - 1, common - 1, -1):
+                        self.entity_list.takeItem(row)
+                    self.entity_list.addItems([text(row, scene_data[row]) for row in range(common, len(scene_data))])
+                    self.entity_list.setCurrentRow(-1)  # as after a full rebuild; the viewport re-selects
+            finally:
+                self.entity_list.setUpdatesEnabled(True)
+
+    @staticmethod
+    def _entity_row_text(index, entity):
+        sprite = entity.get("sprite")
+        kind = f"Sprite:{sprite}" if sprite else "Rect"
+        return f"{index} | {kind} | ({entity['x']},{entity['y']}) {entity['w']}x{entity['h']}"
 
     def on_entity_row_changed(self, row):
+        if self.engine_widget is None:
+            return
         self.engine_widget.set_selected_index(row)
         self.populate_inspector(row)
 
     def on_viewport_selection_changed(self, row):
-        self.entity_list.blockSignals(True)
-        self.entity_list.setCurrentRow(row)
-        self.entity_list.blockSignals(False)
+        with QSignalBlocker(self.entity_list):
+            self.entity_list.setCurrentRow(row)
         self.populate_inspector(row)
 
     def populate_inspector(self, row):
-        scene = self.engine_widget.get_scene_data()
+        if self.sprite_label is None:
+            return  # filled when the Inspector dock is first shown
+        scene = self.engine_widget.get_scene_data() if self.engine_widget is not None else []
         if not (0 <= row < len(scene)):
+            self._inspector_sig = None
             self.sprite_label.setText("(none)")
             return
         entity = scene[row]
-        self.pos_x_spin.setValue(entity["x"])
-        self.pos_y_spin.setValue(entity["y"])
-        self.width_spin.setValue(entity["w"])
-        self.height_spin.setValue(entity["h"])
-        self.color_r_spin.setValue(entity["color"][0])
-        self.color_g_spin.setValue(entity["color"][1])
-        self.color_b_spin.setValue(entity["color"][2])
+        values = (entity["x"], entity["y"], entity["w"], entity["h"], *entity["color"][:3])
+        sig = (row, values, entity.get("sprite"))
+        if sig == self._inspector_sig:
+            return
+        for spin, value in zip(self._inspector_spins, values):
+            with QSignalBlocker(spin):
+                spin.setValue(value)
         self.sprite_label.setText(entity.get("sprite") or "(none)")
+        self._inspector_sig = sig
+
+    def _on_inspector_edited(self):
+        # The spins no longer show the entity, so the next populate must rewrite them
+        self._inspector_sig = None
 
     def apply_inspector_changes(self):
         row = self.entity_list.currentRow()
-        ok = self.engine_widget.update_selected_entity(
-            self.pos_x_spin.value(),
-            self.pos_y_spin.value(),
-            self.width_spin.value(),
-            self.height_spin.value(),
-            (self.color_r_spin.value(), self.color_g_spin.value(), self.color_b_spin.value()),
-        )
+        x, y, w, h, r, g, b = [spin.value() for spin in self._inspector_spins]
+        ok = self.engine_widget.update_selected_entity(x, y, w, h, (r, g, b))
         if ok:
+            # update_selected_entity already refreshed the list through on_world_changed
             self.set_status(f"Entity {row} updated")
-            self.refresh_entity_list(self.engine_widget.get_scene_data())
             self.entity_list.setCurrentRow(row)
         else:
             self.set_status("No selected entity")
@@ -913,9 +1105,21 @@ pygame.quit()
 
         self.save_project()
         export_path = os.path.join(self.current_project_dir, "play_game.py")
-        scene_path = os.path.join(self.scenes_dir_for_current_project(), self.main_scene_name)
-        assets_path = self.assets_dir_for_current_project()
-        script = build_playable_script(scene_path, assets_path)
+        # Forward slashes need no escaping inside the script and open() accepts them on Windows too
+        scene_path = (Path(self.scenes_dir_for_current_project()) / self.main_scene_name).as_posix()
+        assets_path = Path(self.assets_dir_for_current_project()).as_posix()
+        atlas_path = (Path(self.current_project_dir) / "atlas.png").as_posix()
+        atlas_rects_path = (Path(self.current_project_dir) / "sprites.json").as_posix()
+
+        # Pack every sprite the exported scene uses; save_project may still be writing it
+        self.scene_saver.wait()
+        try:
+            entities = read_json(scene_path).get("entities", [])
+        except (OSError, ValueError):
+            entities = []
+        sprite_names = sorted({entity["sprite"] for entity in entities if entity.get("sprite")})
+        write_json(atlas_rects_path, pack_sprite_atlas(sprite_names, assets_path, atlas_path))
+        script = build_playable_script(scene_path, assets_path, atlas_path, atlas_rects_path)
 
         with open(export_path, "w", encoding="utf-8") as f:
             f.write(script)
@@ -953,9 +1157,19 @@ pygame.quit()
             return os.path.dirname(sys.executable)
         return os.getcwd()
 
+    def _create_engine_widget(self):
+        pygame.init()
+        self.engine_widget = PygameWidget(backend_type="pygame")
+        self.engine_widget.on_world_changed = self.refresh_entity_list
+        self.engine_widget.on_selection_changed = self.on_viewport_selection_changed
+        self.engine_widget.on_message = self.set_status
+        self.viewport_stack.insertWidget(0, self.engine_widget)
+        self._apply_grid_settings()
+
     def ensure_engine_visible(self):
-        if hasattr(self, "viewport_stack"):
-            self.viewport_stack.setCurrentWidget(self.engine_widget)
+        if self.engine_widget is None:
+            self._create_engine_widget()
+        self.viewport_stack.setCurrentWidget(self.engine_widget)
         initialized = False
         if not self.engine_widget.renderer:
             self.engine_widget.initialize_engine()
@@ -964,15 +1178,24 @@ pygame.quit()
         if initialized:
             self.set_status("Scene Viewport ready")
 
+    def showEvent(self, event):
+        if not self._shown_once:
+            # Maximizing before the first show lays the window out once, at its final size
+            self._shown_once = True
+            self.setWindowState(self.windowState() | Qt.WindowMaximized)
+        super().showEvent(event)
+
     def closeEvent(self, event):
         if hasattr(self, "plugin_manager"):
             self.plugin_manager.emit("on_before_close")
-        if hasattr(self, "engine_widget") and self.engine_widget.timer:
+        if hasattr(self, "scene_saver"):
+            self.scene_saver.wait()
+        if self.engine_widget is not None and self.engine_widget.timer:
             self.engine_widget.timer.stop()
         if hasattr(self, "scene3d_widget") and self.scene3d_widget.timer:
             self.scene3d_widget.timer.stop()
         self._close_backend_previews()
-        if hasattr(self, "engine_widget") and self.engine_widget.renderer:
+        if self.engine_widget is not None and self.engine_widget.renderer:
             self.engine_widget.renderer.cleanup()
         try:
             pygame.display.quit()
@@ -1,13 +1,38 @@
+import functools
 import importlib.util
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from PyQt5.QtWidgets import QDockWidget
 
+PLUGIN_IMPORT_WORKERS = max(2, (os.cpu_count() or 1) - 1)
+
+@functools.lru_cache(maxsize=4)
+def _plugin_dirs(runtime_base_dir):
+    candidates = [
+        os.path.join(runtime_base_dir, "Plugins"),
+        os.path.join(runtime_base_dir, "plugins"),
+        os.path.join(runtime_base_dir, "Resource", "Plugins"),
+        os.path.join(runtime_base_dir, "Resource", "plugins"),
+    ]
+    seen = set()
+    unique = []
+    for path in candidates:
+        norm = os.path.normcase(os.path.abspath(path))
+        if norm in seen:
+            continue
+        seen.add(norm)
+        unique.append(path)
+    return tuple(unique)
+
 class PluginManager:
     def __init__(self, host_window):
         self.host_window = host_window
         self.modules = []
         self.instances = []
+        self._pending = {}  # file key -> (index, candidates, declared hooks), not imported yet
+        self._hooks = {}  # hook name -> [(callable, owner label)], rebuilt when plugins load
 
     def _log(self, message):
         try:
@@ -15,105 +40,152 @@ class PluginManager:
         except Exception:
             pass
 
-    def _plugin_dirs(self, runtime_base_dir):
-        candidates = [
-            os.path.join(runtime_base_dir, "Plugins"),
-            os.path.join(runtime_base_dir, "plugins"),
-            os.path.join(runtime_base_dir, "Resource", "Plugins"),
-            os.path.join(runtime_base_dir, "Resource", "plugins"),
-        ]
-        seen = set()
-        unique = []
-        for path in candidates:
-            norm = os.path.normcase(os.path.abspath(path))
-            if norm in seen:
+    def _discover(self, runtime_base_dir):
+        """Return [(file_key, [(filename, full_path), ...])] in load order.
+
+        A plugin name found in several directories keeps every location so a
+        later copy can stand in when the first one fails to load.
+        """
+        found = {}
+        for plugin_dir in _plugin_dirs(runtime_base_dir):
+            try:
+                # scandir carries the file type, so no separate isdir/stat per entry
+                with os.scandir(plugin_dir) as entries:
+                    files = sorted(
+                        (entry.name, entry.path)
+                        for entry in entries
+                        if entry.name.endswith(".py") and not entry.name.startswith("_") and entry.is_file()
+                    )
+            except OSError:
                 continue
-            seen.add(norm)
-            unique.append(path)
-        return unique
+            for filename, full_path in files:
+                found.setdefault(filename.lower(), []).append((filename, full_path))
+        return list(found.items())
+
+    @staticmethod
+    def _import_one(module_name, full_path):
+        """Execute a plugin file; runs on a worker thread, so it must not touch Qt or log."""
+        spec = importlib.util.spec_from_file_location(module_name, full_path)
+        if not spec or not spec.loader:
+            return None
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def _initialize(self, module):
+        """Call the plugin's entry point on the GUI thread; False when it has none."""
+        if hasattr(module, "register") and callable(module.register):
+            result = module.register(self.host_window)
+        elif hasattr(module, "setup") and callable(module.setup):
+            # Backward-compatible entry point used by some external plugins.
+            result = module.setup(self.host_window)
+        elif hasattr(module, "Plugin"):
+            result = module.Plugin()
+        else:
+            return False
+        if result is not None:
+            self.instances.append(result)
+            if isinstance(result, QDockWidget):
+                self.host_window.register_plugin_dock(result)
+        return True
+
+    @staticmethod
+    def _manifest_hooks(full_path):
+        """Hooks listed in the plugin's sidecar manifest (name.json), or None to load it eagerly."""
+        manifest_path = os.path.splitext(full_path)[0] + ".json"
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as handle:
+                hooks = json.load(handle).get("hooks")
+        except (OSError, ValueError, AttributeError):
+            return None
+        return set(hooks) if isinstance(hooks, list) else None
+
+    def _load_one(self, index, candidates, first=None):
+        """Import and initialize the first working candidate; `first` is its import already in flight."""
+        self._hooks.clear()
+        for attempt, (filename, full_path) in enumerate(candidates):
+            try:
+                if attempt == 0 and first is not None:
+                    module = first.result()
+                else:
+                    module = self._import_one(self._module_name(filename, index, attempt), full_path)
+                if module is None:
+                    self._log(f"Plugin skipped (invalid spec): {filename}")
+                    continue
+                self.modules.append(module)
+                if not self._initialize(module):
+                    self._log(
+                        f"Plugin skipped (no entry point): {filename} "
+                        f"(expected register(app), setup(app), or class Plugin)"
+                    )
+                    continue
+                self._log(f"Plugin loaded: {filename}")
+                return True
+            except Exception as exc:
+                self._log(f"Plugin load failed: {filename} ({exc})")
+        return False
+
+    @staticmethod
+    def _module_name(filename, index, attempt=0):
+        return f"neopyxel_plugin_{os.path.splitext(filename)[0]}_{index}_{attempt}"
 
     def load_plugins(self, runtime_base_dir):
         self.modules = []
         self.instances = []
+        self._pending = {}
+        self._hooks.clear()
+        eager = []
+        for index, (file_key, candidates) in enumerate(self._discover(runtime_base_dir)):
+            hooks = self._manifest_hooks(candidates[0][1])
+            if hooks is None:
+                eager.append((index, candidates))
+            else:
+                # Deferred until emit() fires one of the hooks its manifest declares
+                self._pending[file_key] = (index, candidates, hooks)
+
         loaded_count = 0
-        loaded_names = set()
+        if eager:
+            # Imports (disk I/O and module side effects) overlap on worker threads;
+            # entry points still run here, one at a time, in directory order.
+            with ThreadPoolExecutor(max_workers=PLUGIN_IMPORT_WORKERS) as pool:
+                futures = [
+                    pool.submit(self._import_one, self._module_name(candidates[0][0], index), candidates[0][1])
+                    for index, candidates in eager
+                ]
+                for (index, candidates), future in zip(eager, futures):
+                    if self._load_one(index, candidates, future):
+                        loaded_count += 1
 
-        for plugin_dir in self._plugin_dirs(runtime_base_dir):
-            if not os.path.isdir(plugin_dir):
-                continue
+        self._log(f"Plugin system ready: {loaded_count} plugin(s), {len(self._pending)} deferred")
 
-            for filename in sorted(os.listdir(plugin_dir)):
-                if not filename.endswith(".py") or filename.startswith("_"):
-                    continue
-                file_key = filename.lower()
-                if file_key in loaded_names:
-                    continue
-                full_path = os.path.join(plugin_dir, filename)
-                module_key = os.path.splitext(filename)[0]
-                module_name = f"neopyxel_plugin_{module_key}_{loaded_count}"
-                try:
-                    spec = importlib.util.spec_from_file_location(module_name, full_path)
-                    if not spec or not spec.loader:
-                        self._log(f"Plugin skipped (invalid spec): {filename}")
-                        continue
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    self.modules.append(module)
-
-                    initialized = False
-                    if hasattr(module, "register") and callable(module.register):
-                        result = module.register(self.host_window)
-                        if result is not None:
-                            self.instances.append(result)
-                            if isinstance(result, QDockWidget):
-                                self.host_window.register_plugin_dock(result)
-                        initialized = True
-                    elif hasattr(module, "setup") and callable(module.setup):
-                        # Backward-compatible entry point used by some external plugins.
-                        result = module.setup(self.host_window)
-                        if result is not None:
-                            self.instances.append(result)
-                            if isinstance(result, QDockWidget):
-                                self.host_window.register_plugin_dock(result)
-                        initialized = True
-                    elif hasattr(module, "Plugin"):
-                        instance = module.Plugin()
-                        self.instances.append(instance)
-                        if isinstance(instance, QDockWidget):
-                            self.host_window.register_plugin_dock(instance)
-                        initialized = True
-
-                    if not initialized:
-                        self._log(
-                            f"Plugin skipped (no entry point): {filename} "
-                            f"(expected register(app), setup(app), or class Plugin)"
-                        )
-                        continue
-
-                    loaded_names.add(file_key)
-                    loaded_count += 1
-                    self._log(f"Plugin loaded: {filename}")
-                except Exception as exc:
-                    self._log(f"Plugin load failed: {filename} ({exc})")
-
-        self._log(f"Plugin system ready: {loaded_count} plugin(s)")
+    def _load_pending(self, hook_name):
+        for file_key, (index, candidates, hooks) in list(self._pending.items()):
+            if hook_name in hooks:
+                del self._pending[file_key]
+                self._load_one(index, candidates)
 
-    def emit(self, hook_name, *args, **kwargs):
+    def _resolve_hooks(self, hook_name):
+        """Collect (callable, owner label) for one hook: module functions first, then instances."""
+        hooks = []
         for module in self.modules:
-            try:
-                hook = getattr(module, hook_name, None)
-                if callable(hook):
-                    hook(*args, **kwargs)
-            except Exception as exc:
-                self._log(f"Plugin hook error: {module.__name__}.{hook_name} ({exc})")
-
+            hook = getattr(module, hook_name, None)
+            if callable(hook):
+                hooks.append((hook, module.__name__))
         for instance in self.instances:
+            hook = getattr(instance, hook_name, None)
+            if callable(hook):
+                hooks.append((hook, instance.__class__.__name__))
+        return hooks
+
+    def emit(self, hook_name, *args, **kwargs):
+        if self._pending:
+            self._load_pending(hook_name)
+
+        hooks = self._hooks.get(hook_name)
+        if hooks is None:
+            hooks = self._hooks[hook_name] = self._resolve_hooks(hook_name)
+        for hook, owner in hooks:
             try:
-                hook = getattr(instance, hook_name, None)
-                if callable(hook):
-                    hook(*args, **kwargs)
+                hook(*args, **kwargs)
             except Exception as exc:
-                self._log(
-                    f"Plugin hook error: {instance.__class__.__name__}.{hook_name} ({exc})"
-                )
-
+                self._log(f"Plugin hook error: {owner}.{hook_name} ({exc})")
@@ -0,0 +1,78 @@
+import json
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; project files then go through the stdlib json module
+    orjson = None
+
+def read_json(path):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_json(path, data):
+    if orjson is not None:
+        # Serialized straight to UTF-8 bytes in C, no intermediate str
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+def write_json_atomic(path, data):
+    """Write next to the target and swap it in, so an interrupted save never leaves a truncated file."""
+    tmp_path = path + ".tmp"
+    write_json(tmp_path, data)
+    os.replace(tmp_path, path)
+
+class _SaveJob(QRunnable):
+    def __init__(self, saver, path):
+        super().__init__()
+        self.saver = saver
+        self.path = path
+
+    def run(self):
+        self.saver._write_pending(self.path)
+
+class SceneSaver(QObject):
+    """Writes JSON files on one background thread; saves of a path still queued collapse into the newest."""
+
+    saveFinished = pyqtSignal(str, str)  # path, error message ("" on success)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)  # a single writer keeps saves of one path in order
+        self._lock = threading.Lock()
+        self._pending = {}  # path -> newest payload not written yet
+
+    def save(self, path, payload):
+        """Queue payload for path; it must not be mutated afterwards."""
+        with self._lock:
+            queued = path in self._pending
+            self._pending[path] = payload
+        if not queued:
+            self._pool.start(_SaveJob(self, path))
+
+    def _write_pending(self, path):
+        with self._lock:
+            payload = self._pending.pop(path, None)
+        if payload is None:
+            return
+        try:
+            write_json_atomic(path, payload)
+            error = ""
+        except Exception as exc:
+            error = str(exc)
+        # Queued across threads, so receivers run on the GUI thread
+        self.saveFinished.emit(path, error)
+
+    def wait(self):
+        """Block until every queued save is on disk."""
+        self._pool.waitForDone()
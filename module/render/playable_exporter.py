@@ -1,16 +1,59 @@
-def build_playable_script(scene_path, assets_path):
-    scene_path = scene_path.replace("\\", "\\\\")
-    assets_path = assets_path.replace("\\", "\\\\")
+import math
+import os
+
+import pygame
+
+ATLAS_MAX_WIDTH = 2048
+
+def pack_sprite_atlas(sprite_names, assets_path, atlas_path):
+    """Shelf-pack the named sprites into one PNG at atlas_path; returns {name: [x, y, w, h]}.
+
+    Sprites that cannot be loaded are left out; the playable loads those itself.
+    """
+    images = []
+    for name in sprite_names:
+        try:
+            images.append((name, pygame.image.load(os.path.join(assets_path, name))))
+        except (pygame.error, OSError):
+            continue
+    if not images:
+        return {}
+
+    # Tallest first keeps the shelves tight
+    images.sort(key=lambda item: item[1].get_height(), reverse=True)
+    area = sum(image.get_width() * image.get_height() for _, image in images)
+    widest = max(image.get_width() for _, image in images)
+    width = max(widest, min(ATLAS_MAX_WIDTH, math.ceil(math.sqrt(area))))
+    rects = {}
+    x = y = row_h = 0
+    for name, image in images:
+        w, h = image.get_size()
+        if x + w > width:
+            x, y, row_h = 0, y + row_h, 0
+        rects[name] = [x, y, w, h]
+        x += w
+        row_h = max(row_h, h)
+
+    atlas = pygame.Surface((width, y + row_h), pygame.SRCALPHA, 32)
+    for name, image in images:
+        # Onto fully transparent pixels a blit copies color and alpha unchanged
+        atlas.blit(image, rects[name][:2])
+    pygame.image.save(atlas, atlas_path)
+    return rects
+
+def build_playable_script(scene_path, assets_path, atlas_path, atlas_rects_path):
+    """Playable script source; all paths are embedded verbatim, so pass them with forward slashes."""
     return f"""import json
 import os
 import pygame
 
 pygame.init()
 screen = pygame.display.set_mode((1280, 720))
-clock = pygame.time.Clock()
 
 SCENE_PATH = r\"{scene_path}\"
 ASSETS_DIR = r\"{assets_path}\"
+ATLAS_PATH = r\"{atlas_path}\"
+ATLAS_RECTS_PATH = r\"{atlas_rects_path}\"
 
 with open(SCENE_PATH, \"r\", encoding=\"utf-8\") as f:
     scene = json.load(f)
@@ -18,9 +61,21 @@ with open(SCENE_PATH, \"r\", encoding=\"utf-8\") as f:
 entities = scene.get(\"entities\", [])
 sprite_cache = {{}}
 
+# Sprites packed at export time are views into one atlas surface; anything else loads from ASSETS_DIR
+try:
+    with open(ATLAS_RECTS_PATH, \"r\", encoding=\"utf-8\") as f:
+        atlas_rects = json.load(f)
+    atlas = pygame.image.load(ATLAS_PATH).convert_alpha()
+except (OSError, ValueError, pygame.error):
+    atlas_rects = {{}}
+    atlas = None
+
 def get_sprite(rel_path):
     if rel_path in sprite_cache:
         return sprite_cache[rel_path]
+    if atlas is not None and rel_path in atlas_rects:
+        spr = sprite_cache[rel_path] = atlas.subsurface(atlas_rects[rel_path])
+        return spr
     full = os.path.join(ASSETS_DIR, rel_path)
     try:
         spr = pygame.image.load(full)
@@ -30,27 +85,57 @@ def get_sprite(rel_path):
     except Exception:
         return None
 
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+solid_cache = {{}}
 
-    screen.fill((20, 20, 25))
+def get_solid(w, h, color):
+    key = (w, h, color)
+    solid = solid_cache.get(key)
+    if solid is None:
+        solid = pygame.Surface((w, h)).convert()
+        solid.fill(color)
+        solid_cache[key] = solid
+    return solid
+
+def build_frame_blits(entities):
+    # Rects become solid surfaces so the whole scene is one batched blit, still in entity order
+    seq = []
     for e in entities:
         x, y = e.get(\"x\", 0), e.get(\"y\", 0)
-        w, h = e.get(\"w\", 16), e.get(\"h\", 16)
         sprite = e.get(\"sprite\")
-        if sprite:
-            spr = get_sprite(sprite)
-            if spr:
-                screen.blit(spr, (x, y))
+        spr = get_sprite(sprite) if sprite else None
+        if spr is None:
+            w, h = e.get(\"w\", 16), e.get(\"h\", 16)
+            if w <= 0 or h <= 0:
                 continue
-        color = tuple(e.get(\"color\", [0, 255, 0]))
-        pygame.draw.rect(screen, color, pygame.Rect(x, y, w, h))
+            spr = get_solid(w, h, tuple(e.get(\"color\", [0, 255, 0])))
+        seq.append((spr, (x, y)))
+    return seq
+
+# fblits (pygame-ce) skips building the list of changed rects that blits returns
+blit_frame = getattr(screen, \"fblits\", None) or (lambda seq: screen.blits(seq, doreturn=False))
+frame_blits = build_frame_blits(entities)
+
+# Nothing in the scene moves, so it is drawn once and only re-presented when the window is exposed
+REPRESENT_EVENTS = {{pygame.VIDEOEXPOSE, getattr(pygame, \"WINDOWEXPOSED\", pygame.VIDEOEXPOSE)}}
+# SDL drops everything else at the queue, so mouse motion and the like never wake the loop
+pygame.event.set_blocked(None)
+pygame.event.set_allowed([pygame.QUIT, *REPRESENT_EVENTS])
+screen.fill((20, 20, 25))
+blit_frame(frame_blits)
+needs_flip = True
 
-    pygame.display.flip()
-    clock.tick(60)
+running = True
+while running:
+    if needs_flip:
+        pygame.display.flip()
+        needs_flip = False
+
+    # With nothing to animate, sleep until the OS has something for us instead of ticking at 60 Hz
+    for event in [pygame.event.wait(), *pygame.event.get()]:
+        if event.type == pygame.QUIT:
+            running = False
+        elif event.type in REPRESENT_EVENTS:
+            needs_flip = True
 
 pygame.quit()
 """
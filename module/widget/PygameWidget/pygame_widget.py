@@ -1,20 +1,35 @@
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pygame
-from PyQt5.QtCore import Qt, QTimer
-from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtCore import QEvent, QPoint, QRect, Qt, QTimer
+from PyQt5.QtGui import QColor, QCursor, QImage, QPainter, QPicture
 from PyQt5.QtWidgets import QWidget
 
 from editor.ui import EditorUI
 from engine.core import EntityManager
 from engine.graphics.opengl_backend import OpenGLBackend
-from engine.graphics.pygame_backend import PygameBackend
+from engine.graphics.pygame_backend import XRGB_MASKS, PygameBackend
 from engine.graphics.renderer import Renderer
 from engine.graphics.vulkan_backend import VulkanBackend
 from engine.lighting import DynamicLighting
 from module.constants import IMAGE_EXTENSIONS
 from module.widget.PygameWidget.tool_manager import ToolManager
 
+FRAME_INTERVAL = 1.0 / 60
+SLOW_FRAME_SECONDS = 1.5  # a frame this slow backs the loop off so Qt input keeps flowing
+SLOW_FRAME_BACKOFF = 0.25
+SPATIAL_CELL_STEPS = 4  # spatial index cells span this many grid steps
+SPRITE_CACHE_SIZE = 128
+SPRITE_DECODE_WORKERS = max(2, (os.cpu_count() or 1) - 1)
+PEN_MIN_DISTANCE_SQ = 20  # squared spacing between pen stroke entities
+# Top-level window events after which the widget may sit somewhere else on screen;
+# some window managers place the frame without sending a Move
+ORIGIN_EVENTS = frozenset((QEvent.Move, QEvent.WindowActivate, QEvent.WindowStateChange))
+
 class PygameWidget(QWidget):
     def __init__(self, parent=None, backend_type="pygame"):
         super().__init__(parent)
@@ -23,10 +38,11 @@ class PygameWidget(QWidget):
         self.setFocusPolicy(Qt.StrongFocus)
         self.setAcceptDrops(True)
 
-        self.timer = QTimer()
+        self.timer = QTimer(self)
         self.timer.setTimerType(Qt.PreciseTimer)
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(16)
+        self.timer.setSingleShot(True)  # each frame schedules the next; started by showEvent
+        self.timer.timeout.connect(self._on_frame_timer)
+        self._next_frame_at = 0.0  # perf_counter deadline the frame timer is aiming at
 
         self.backend_type = backend_type
         self.renderer = None
@@ -35,6 +51,8 @@ class PygameWidget(QWidget):
         self.ui = None
         self.clock = pygame.time.Clock()
         self.qimage = None
+        self._frame_buffer = None  # pixels behind self.qimage; reused every frame on the 32-bit path
+        self._frame_shape = None  # (width, height, pitch) _frame_buffer was allocated for
 
         self.project_assets_dir = None
 
@@ -43,20 +61,34 @@ class PygameWidget(QWidget):
         self.drag_start = None
         self.last_pen_pos = None
         self.current_stroke_entities = []
+        self._pen_samples = []  # snapped pen positions not yet turned into entities
         self.undo_stack = []
         self.selected_index = -1
 
         self.snap_enabled = True
         self.show_grid = True
         self.grid_size = 16
+        self._snap_shift = self._pow2_shift(self.grid_size)
         self.editor_lighting_enabled = False
+        self._light_mouse_pos = None  # cursor position the editor light was last drawn at
         self.show_runtime_stats = False
         self.hover_internal_pos = None
+        self._scale_to_internal = None  # widget -> internal multipliers, None until there is a renderer and a size
+        self._scale_to_widget = (1.0, 1.0)
+        self._widget_size = (0, 0)
+        self._global_origin = QPoint()  # screen position of the widget's top-left corner
+        self._origin_window = None  # top-level window whose moves refresh _global_origin
+        self._painted_overlay = QRect()  # widget area the preview overlay covered at the last paint
+        self._overlay_update_pending = False
         self.drag_asset_rel = None
         self.drag_asset_size = (32, 32)
         self.grid_cache_image = None
         self.grid_cache_key = None
         self.needs_redraw = True
+        self._dirty_rects = []  # internal-res rects to repaint next frame when no full redraw is due
+        self._spatial = None  # (cell, sorted cell keys, entity indices in key order) by rect centre, built on demand
+        self._sprite_cache = OrderedDict()  # (abs path, mtime) -> surface prepared for the current backend
+        self._scene_rows = None  # get_scene_data rows for a prefix of world.entities; appends keep it valid
 
         self.on_world_changed = None
         self.on_selection_changed = None
@@ -85,9 +117,12 @@ class PygameWidget(QWidget):
 
         if self.renderer:
             self.renderer.cleanup()
+        self._sprite_cache.clear()
         self.renderer = Renderer(backend, internal_res, screen_res)
+        self._update_scale()
         self.lighting = DynamicLighting(internal_res)
         self.world = EntityManager()
+        self._scene_rows = None
         self.ui = EditorUI(16)
         self.undo_stack.clear()
         self.selected_index = -1
@@ -100,6 +135,8 @@ class PygameWidget(QWidget):
         self.snap_enabled = bool(snap_enabled)
         self.show_grid = bool(show_grid)
         self.grid_size = max(2, int(grid_size))
+        self._snap_shift = self._pow2_shift(self.grid_size)
+        self._spatial = None
         self.grid_cache_image = None
         self.grid_cache_key = None
         self.needs_redraw = True
@@ -112,48 +149,104 @@ class PygameWidget(QWidget):
     def update_frame(self):
         if not self.renderer or not self.world:
             return
+        self._flush_pen_samples()
 
-        if not self.editor_lighting_enabled and not self.needs_redraw:
+        # Covered by another dock tab or window: nothing would be seen
+        if self.visibleRegion().isEmpty():
             return
 
-        try:
-            pygame.event.pump()
-        except Exception:
-            pass
-        self.world.update_all()
+        full = self.needs_redraw
+        mouse_pos = None
+        if self.editor_lighting_enabled:
+            cursor = QCursor.pos()
+            origin = self._global_origin
+            mouse_pos = (cursor.x() - origin.x(), cursor.y() - origin.y())
+            full = full or mouse_pos != self._light_mouse_pos
+        if not (full or self._dirty_rects):
+            return
+
+        # Only a backend with its own SDL window has events to drain; the embedded
+        # viewport gets its input from Qt.
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            try:
+                pygame.event.pump()
+            except Exception:
+                pass
+        if self.world.update_all():
+            full = True
+            self._scene_rows = None
+            self._spatial = None  # indexed by the centres that just moved
+
+        # Only the marked regions changed: the backend keeps the rest of the last frame.
+        # Stats text changes every frame, so it always takes the full path.
+        dirty = None
+        if not full and not self.show_runtime_stats:
+            dirty = self._dirty_rects[0].unionall(self._dirty_rects[1:]).clip(self.renderer.screen_rect)
+        self._dirty_rects.clear()
+        if dirty is not None:
+            if not dirty:
+                return
+            self.renderer.backend.mark_dirty(dirty)
 
         active_lighting = None
         if self.editor_lighting_enabled:
-            mouse_pos = self.mapFromGlobal(self.cursor().pos())
+            self._light_mouse_pos = mouse_pos
             self.lighting.clear()
-            if self.rect().contains(mouse_pos):
-                internal_pos = self._to_internal(mouse_pos)
-                if internal_pos:
-                    self.lighting.add_light(internal_pos, 60)
+            scale = self._scale_to_internal
+            width, height = self._widget_size
+            if scale is not None and 0 <= mouse_pos[0] < width and 0 <= mouse_pos[1] < height:
+                internal_pos = (int(mouse_pos[0] * scale[0]), int(mouse_pos[1] * scale[1]))
+                self.lighting.add_light(internal_pos, 60)
             active_lighting = self.lighting
 
         ui = self.ui if self.show_runtime_stats else None
         clock = self.clock if self.show_runtime_stats else None
-        self.renderer.render(self.world.get_all(), active_lighting, ui, clock)
-        self.clock.tick(60)
+        self.renderer.render(self.world, active_lighting, ui, clock)
+        if clock:
+            clock.tick()  # measures FPS for the stats overlay only; the frame timer does the pacing
 
         if self.backend_type == "pygame" and hasattr(self.renderer.backend, "internal_surface"):
             surf = self.renderer.backend.internal_surface
             if surf:
-                data = pygame.image.tostring(surf, "RGB")
                 # Copy image buffer to avoid dangling-memory artifacts and draw with fast scaling in paintEvent.
-                self.qimage = QImage(data, surf.get_width(), surf.get_height(), QImage.Format_RGB888).copy()
+                if surf.get_bitsize() == 32 and surf.get_masks()[:3] == XRGB_MASKS[:3]:
+                    # Native 0xffRRGGBB pixels: one copy into a buffer the QImage keeps wrapping.
+                    shape = (surf.get_width(), surf.get_height(), surf.get_pitch())
+                    if shape != self._frame_shape:
+                        self._frame_shape = shape
+                        self._frame_buffer = bytearray(shape[1] * shape[2])
+                        self.qimage = QImage(self._frame_buffer, *shape, QImage.Format_RGB32)
+                        dirty = None  # a fresh buffer needs every row
+                    if dirty is not None:
+                        # Only the rows the partial frame touched differ from what is already there
+                        start, end = dirty.top * shape[2], dirty.bottom * shape[2]
+                        self._frame_buffer[start:end] = memoryview(surf.get_buffer())[start:end]
+                    else:
+                        self._frame_buffer[:] = surf.get_buffer()
+                else:
+                    # tostring already returns a fresh buffer; keeping it alive beside the
+                    # QImage replaces QImage.copy(), the second full-frame copy
+                    self._frame_shape = None
+                    self._frame_buffer = pygame.image.tostring(surf, "RGB")
+                    self.qimage = QImage(
+                        self._frame_buffer, surf.get_width(), surf.get_height(), surf.get_width() * 3, QImage.Format_RGB888
+                    )
 
         self.needs_redraw = False
-        self.update()
+        self.update(self._to_widget_rect(dirty) if dirty is not None else self.rect())
 
     def paintEvent(self, event):
         if self.backend_type == "pygame" and self.qimage:
             painter = QPainter(self)
-            painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
-            painter.drawImage(self.rect(), self.qimage)
+            if self.qimage.size() == self.size():
+                # 1:1 with the internal resolution: a plain blit, no trip through the scaler
+                painter.drawImage(0, 0, self.qimage)
+            else:
+                painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+                painter.drawImage(self.rect(), self.qimage)
             self._draw_grid_overlay(painter)
             self._draw_preview_overlay(painter)
+            self._painted_overlay = self._overlay_rect(self.hover_internal_pos)
             return
 
         painter = QPainter(self)
@@ -176,9 +269,9 @@ class PygameWidget(QWidget):
 
         key = (self.width(), self.height(), round(step_x, 3), round(step_y, 3))
         if self.grid_cache_key != key or self.grid_cache_image is None:
-            img = QImage(self.width(), self.height(), QImage.Format_ARGB32_Premultiplied)
-            img.fill(0)
-            gp = QPainter(img)
+            # Recorded line commands, replayed each paint: no widget-sized image to allocate and fill
+            picture = QPicture()
+            gp = QPainter(picture)
             gp.setPen(QColor(95, 110, 140, 70))
             x = 0.0
             while x <= self.width():
@@ -190,9 +283,9 @@ class PygameWidget(QWidget):
                 y += step_y
             gp.end()
             self.grid_cache_key = key
-            self.grid_cache_image = img
+            self.grid_cache_image = picture
 
-        painter.drawImage(0, 0, self.grid_cache_image)
+        painter.drawPicture(0, 0, self.grid_cache_image)
 
     def _draw_preview_overlay(self, painter):
         if not self.renderer:
@@ -213,12 +306,44 @@ class PygameWidget(QWidget):
 
         if self.drag_asset_rel and self.hover_internal_pos:
             gx, gy = self._to_widget(self.hover_internal_pos)
-            gw = max(8, int(self.drag_asset_size[0] * (self.width() / self.renderer.internal_res[0])))
-            gh = max(8, int(self.drag_asset_size[1] * (self.height() / self.renderer.internal_res[1])))
+            gw, gh = self._drag_ghost_size()
             painter.setBrush(QColor(80, 180, 255, 70))
             painter.setPen(QColor(130, 210, 255, 180))
             painter.drawRect(gx, gy, gw, gh)
 
+    def _drag_ghost_size(self):
+        scale_x, scale_y = self._scale_to_widget
+        return max(8, int(self.drag_asset_size[0] * scale_x)), max(8, int(self.drag_asset_size[1] * scale_y))
+
+    def _overlay_rect(self, hover):
+        """Widget-space bounds of what _draw_preview_overlay paints for this hover position."""
+        rect = QRect()
+        if not (self.renderer and hover):
+            return rect
+        if self.is_drawing and self.draw_tool in ("Line", "Rect") and self.drag_start:
+            sx, sy = self._to_widget(self.drag_start)
+            ex, ey = self._to_widget(hover)
+            rect = QRect(QPoint(min(sx, ex), min(sy, ey)), QPoint(max(sx, ex), max(sy, ey)))
+        if self.drag_asset_rel:
+            gx, gy = self._to_widget(hover)
+            rect = rect.united(QRect(gx, gy, *self._drag_ghost_size()))
+        # Pen strokes reach one pixel past the geometry
+        return rect.adjusted(-2, -2, 2, 2) if not rect.isNull() else rect
+
+    def _set_hover(self, pos):
+        """Move the hover point; the overlay repaint waits until pending input has been handled."""
+        if pos == self.hover_internal_pos:
+            return
+        self.hover_internal_pos = pos
+        if not self._overlay_update_pending:
+            self._overlay_update_pending = True
+            QTimer.singleShot(0, self._flush_overlay_update)
+
+    def _flush_overlay_update(self):
+        """Repaint where the overlay was last painted and where it is now; the frame itself is unchanged."""
+        self._overlay_update_pending = False
+        self.update(self._painted_overlay.united(self._overlay_rect(self.hover_internal_pos)))
+
     def dragEnterEvent(self, event):
         text = event.mimeData().text()
         if text and text.lower().endswith(IMAGE_EXTENSIONS):
@@ -237,11 +362,7 @@ class PygameWidget(QWidget):
     def dragMoveEvent(self, event):
         internal_pos = self._to_internal(event.pos())
         if internal_pos:
-            snapped = self._apply_snap(internal_pos)
-            if snapped != self.hover_internal_pos:
-                self.hover_internal_pos = snapped
-                self.needs_redraw = True
-                self.update()
+            self._set_hover(self._apply_snap(internal_pos))
         event.acceptProposedAction()
 
     def dragLeaveEvent(self, event):
@@ -290,10 +411,57 @@ class PygameWidget(QWidget):
         self.update()
         event.acceptProposedAction()
 
-    def leaveEvent(self, event):
-        self.hover_internal_pos = None
+    def _on_frame_timer(self):
+        started = time.perf_counter()
+        self.update_frame()
+        now = time.perf_counter()
+        if now - started > SLOW_FRAME_SECONDS:
+            self._next_frame_at = now + SLOW_FRAME_BACKOFF
+        else:
+            # Deadlines sit on a fixed FRAME_INTERVAL grid, so a late wakeup or the whole-ms
+            # timer rounding shortens the next wait instead of accumulating as drift.
+            # When a frame ran past its slot, the grid restarts from now rather than bursting.
+            self._next_frame_at = max(self._next_frame_at + FRAME_INTERVAL, now)
+        delay = self._next_frame_at - now
+        if self.isVisible():
+            self.timer.start(int(delay * 1000))
+
+    def showEvent(self, event):
+        if not self.timer.isActive():
+            self._next_frame_at = time.perf_counter()
+            self.timer.start(0)
         self.needs_redraw = True
-        self.update()
+        # Docking and undocking hand the widget to a different top-level window
+        window = self.window()
+        if window is not self._origin_window:
+            if self._origin_window is not None:
+                self._origin_window.removeEventFilter(self)
+            if window is not self:
+                window.installEventFilter(self)
+            self._origin_window = window
+        self._update_origin()
+        super().showEvent(event)
+
+    def resizeEvent(self, event):
+        self._update_scale()
+        self._update_origin()
+        super().resizeEvent(event)
+
+    def moveEvent(self, event):
+        self._update_origin()
+        super().moveEvent(event)
+
+    def eventFilter(self, obj, event):
+        if obj is self._origin_window and event.type() in ORIGIN_EVENTS:
+            self._update_origin()
+        return super().eventFilter(obj, event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def leaveEvent(self, event):
+        self._set_hover(None)
         super().leaveEvent(event)
 
     def mousePressEvent(self, event):
@@ -303,8 +471,7 @@ class PygameWidget(QWidget):
         if not internal_pos:
             return
         internal_pos = self._apply_snap(internal_pos)
-        self.hover_internal_pos = internal_pos
-        self.needs_redraw = True
+        self._set_hover(internal_pos)
 
         if event.button() == Qt.LeftButton:
             self.is_drawing = True
@@ -328,23 +495,19 @@ class PygameWidget(QWidget):
                 removed = self._remove_nearest_entity(internal_pos[0], internal_pos[1], radius=20)
                 if removed:
                     self.undo_stack.append({"type": "remove", "entities": removed})
-                    self._notify_world_changed()
+                    self._notify_world_changed(partial=True)
         elif event.button() == Qt.RightButton:
             removed = self._remove_nearest_entity(internal_pos[0], internal_pos[1], radius=20)
             if removed:
                 self.undo_stack.append({"type": "remove", "entities": removed})
-                self._notify_world_changed()
+                self._notify_world_changed(partial=True)
 
     def mouseMoveEvent(self, event):
         if not (self.world and self.renderer):
             return
         internal_pos = self._to_internal(event.pos())
         if internal_pos:
-            snapped = self._apply_snap(internal_pos)
-            if snapped != self.hover_internal_pos:
-                self.hover_internal_pos = snapped
-                self.needs_redraw = True
-                self.update()
+            self._set_hover(self._apply_snap(internal_pos))
         if not self.is_drawing:
             return
         if self.draw_tool != "Pen":
@@ -355,20 +518,27 @@ class PygameWidget(QWidget):
         internal_pos = self._to_internal(event.pos())
         if not internal_pos:
             return
-        internal_pos = self._apply_snap(internal_pos)
-        if self.last_pen_pos and self._distance_sq(internal_pos, self.last_pen_pos) < 20:
-            return
+        # Turned into entities once per frame (or on release) by _flush_pen_samples
+        self._pen_samples.append(self._apply_snap(internal_pos))
 
-        entity = self._add_rect_entity(internal_pos[0], internal_pos[1], (60, 230, 120))
-        if entity:
-            self.current_stroke_entities.append(entity)
-            self.last_pen_pos = internal_pos
-            self._notify_world_changed()
+    def _flush_pen_samples(self):
+        """Filter buffered pen samples by spacing in one pass and add the survivors as one batch."""
+        if not self._pen_samples:
+            return
+        xs, ys = ToolManager.densify_points(self._pen_samples, self.last_pen_pos, PEN_MIN_DISTANCE_SQ)
+        self._pen_samples.clear()
+        if not len(xs):
+            return
+        added = self._add_rect_entities(xs, ys, ToolManager.color_for("Pen"))
+        self.current_stroke_entities.extend(added)
+        self.last_pen_pos = (int(xs[-1]), int(ys[-1]))
+        self._notify_world_changed(partial=True)
 
     def mouseReleaseEvent(self, event):
         if event.button() != Qt.LeftButton or not self.is_drawing:
             return
 
+        self._flush_pen_samples()
         self.is_drawing = False
         end_pos = self._to_internal(event.pos()) or self.drag_start
         if not end_pos or not self.drag_start:
@@ -379,12 +549,12 @@ class PygameWidget(QWidget):
             added = self._draw_line_entities(self.drag_start, end_pos)
             if added:
                 self.undo_stack.append({"type": "add", "entities": added})
-                self._notify_world_changed()
+                self._notify_world_changed(partial=True)
         elif self.draw_tool == "Rect":
             added = self._draw_rect_entities(self.drag_start, end_pos)
             if added:
                 self.undo_stack.append({"type": "add", "entities": added})
-                self._notify_world_changed()
+                self._notify_world_changed(partial=True)
         elif self.draw_tool == "Pen" and self.current_stroke_entities:
             self.undo_stack.append({"type": "add", "entities": list(self.current_stroke_entities)})
 
@@ -392,7 +562,7 @@ class PygameWidget(QWidget):
         self.last_pen_pos = None
         self.current_stroke_entities = []
         self.hover_internal_pos = None
-        self.needs_redraw = True
+        # Only the Line/Rect preview goes away here; the pixels drawn were queued as dirty rects
         self.update()
 
     def set_draw_tool(self, tool_name):
@@ -408,20 +578,17 @@ class PygameWidget(QWidget):
         if self.on_selection_changed:
             self.on_selection_changed(self.selected_index)
 
-    def add_rect_entity(self, x, y, width=16, height=16, color=(0, 255, 0)):
+    def add_rect_entity(self, x, y, width=16, height=16, color=(0, 255, 0), notify=True):
+        """notify=False leaves listeners and selection to a caller adding a batch."""
         x, y = self._apply_snap((x, y))
-        entity = self._add_rect_entity(x, y, color)
-        if entity:
-            entity.rect.width = width
-            entity.rect.height = height
-            entity.image = pygame.Surface((width, height))
-            entity.image.fill(color)
-            entity.sprite_path = None
+        entity = self.world.add_entity(x, y, color, width, height)
+        entity.sprite_path = None
+        if notify:
             self._notify_world_changed()
             self.set_selected_index(len(self.world.entities) - 1)
         return entity
 
-    def add_sprite_entity(self, x, y, sprite_rel_path):
+    def add_sprite_entity(self, x, y, sprite_rel_path, notify=True):
         if not self.project_assets_dir:
             return None
         x, y = self._apply_snap((x, y))
@@ -430,24 +597,23 @@ class PygameWidget(QWidget):
         if not surface:
             return None
 
-        self.world.add_entity(x, y, (255, 255, 255))
-        entity = self.world.entities[-1]
-        entity.image = surface
-        entity.rect.width = surface.get_width()
-        entity.rect.height = surface.get_height()
-        entity.color = (255, 255, 255)
+        entity = self.world.add_entity(
+            x, y, (255, 255, 255), surface.get_width(), surface.get_height(), image=surface
+        )
         entity.sprite_path = sprite_rel_path.replace("\\", "/")
 
         self.undo_stack.append({"type": "add", "entities": [entity]})
-        self._notify_world_changed()
-        self.set_selected_index(len(self.world.entities) - 1)
+        if notify:
+            self._notify_world_changed()
+            self.set_selected_index(len(self.world.entities) - 1)
         return entity
 
     def delete_selected_entity(self):
         if not self.world:
             return False
         if 0 <= self.selected_index < len(self.world.entities):
-            entity = self.world.entities.pop(self.selected_index)
+            entity = self.world.remove_at(self.selected_index)
+            self._scene_row_changed(self.selected_index, removed=True)
             data = [self._snapshot_entity(entity)]
             self.undo_stack.append({"type": "remove_full", "entities": data})
             self.set_selected_index(-1)
@@ -461,17 +627,13 @@ class PygameWidget(QWidget):
         if not (0 <= self.selected_index < len(self.world.entities)):
             return False
         entity = self.world.entities[self.selected_index]
-        entity.rect.x = x
-        entity.rect.y = y
-
         if getattr(entity, "sprite_path", None):
-            entity.color = (255, 255, 255)
+            self.world.update_entity(
+                self.selected_index, x, y, entity.rect.width, entity.rect.height, (255, 255, 255), entity.image
+            )
         else:
-            entity.rect.width = w
-            entity.rect.height = h
-            entity.color = tuple(color)
-            entity.image = pygame.Surface((w, h))
-            entity.image.fill(entity.color)
+            self.world.update_entity(self.selected_index, x, y, w, h, tuple(color))
+        self._scene_row_changed(self.selected_index)
 
         self._notify_world_changed()
         return True
@@ -479,31 +641,54 @@ class PygameWidget(QWidget):
     def clear_scene(self):
         if not self.world:
             return
-        self.world.entities.clear()
+        self.world.clear()
+        self._scene_rows = None
         self.undo_stack.clear()
         self.set_selected_index(-1)
         self._notify_world_changed()
 
     def get_scene_data(self):
+        """One row per entity; the list is shared between calls, so treat it as read-only."""
         if not self.world:
             return []
-        data = []
-        for entity in self.world.entities:
-            sprite_path = getattr(entity, "sprite_path", None)
-            data.append(
-                {
-                    "x": entity.rect.x,
-                    "y": entity.rect.y,
-                    "w": entity.rect.width,
-                    "h": entity.rect.height,
-                    "color": [int(entity.color[0]), int(entity.color[1]), int(entity.color[2])],
-                    "sprite": sprite_path,
-                }
-            )
-        return data
+        entities = self.world.entities
+        rows = self._scene_rows
+        if rows is None or len(rows) > len(entities):
+            rows = []
+        if len(rows) < len(entities):
+            # Only entities appended since the last call need new rows; a new list
+            # keeps any earlier result unchanged for whoever still holds it.
+            # Geometry and colour come out of the manager's packed arrays in one tolist() each.
+            start, end = len(rows), len(entities)
+            world = self.world
+            rows = rows + [
+                {"x": x, "y": y, "w": w, "h": h, "color": color, "sprite": entity.sprite_path}
+                for (x, y), (w, h), color, entity in zip(
+                    world.pos[start:end].tolist(),
+                    world.size[start:end].tolist(),
+                    world.color[start:end].tolist(),
+                    entities[start:end],
+                )
+            ]
+            self._scene_rows = rows
+        return rows
+
+    def _scene_row_changed(self, index, removed=False):
+        """Patch the cached scene rows after one entity was edited or removed in place."""
+        rows = self._scene_rows
+        if rows is None or index >= len(rows):
+            return
+        if removed:
+            self._scene_rows = rows[:index] + rows[index + 1:]
+        else:
+            self._scene_rows = rows[:index] + [self._snapshot_entity(self.world.entities[index])] + rows[index + 1:]
 
     def load_scene_data(self, entities):
         self.clear_scene()
+        if self.project_assets_dir:
+            self._prefetch_sprites(
+                os.path.join(self.project_assets_dir, item["sprite"]) for item in entities if item.get("sprite")
+            )
         for item in entities:
             x = int(item.get("x", 0))
             y = int(item.get("y", 0))
@@ -527,43 +712,66 @@ class PygameWidget(QWidget):
         action = self.undo_stack.pop()
 
         if action["type"] == "add":
-            for entity in action["entities"]:
-                if entity in self.world.entities:
-                    self.world.entities.remove(entity)
+            self.world.remove_entities(action["entities"])
+            self._scene_rows = None
             self._notify_world_changed()
             return True
 
         if action["type"] in ("remove", "remove_full"):
+            # One notification for the whole batch instead of a scene rebuild per entity
             for saved in action["entities"]:
                 self._restore_entity(saved)
             self._notify_world_changed()
+            if action["entities"]:
+                self.set_selected_index(len(self.world.entities) - 1)
             return True
 
         return False
 
-    def _to_internal(self, qt_pos):
+    def _update_scale(self):
+        """Recompute the widget/internal scale factors; called on resize and engine (re)initialisation."""
+        self._widget_size = (self.width(), self.height())
         if not self.renderer:
+            self._scale_to_internal = None
+            return
+        internal_w, internal_h = self.renderer.internal_res
+        w, h = self._widget_size
+        self._scale_to_internal = (internal_w / w, internal_h / h) if w > 0 and h > 0 else None
+        self._scale_to_widget = (w / max(1, internal_w), h / max(1, internal_h))
+
+    def _update_origin(self):
+        """Cache the widget's screen position so the per-frame cursor lookup is a subtraction."""
+        self._global_origin = self.mapToGlobal(QPoint(0, 0))
+
+    def _to_internal(self, qt_pos):
+        scale = self._scale_to_internal
+        if scale is None:
             return None
-        w = self.width()
-        h = self.height()
-        if w <= 0 or h <= 0:
-            return None
-        internal_res = self.renderer.internal_res
-        scale_x = internal_res[0] / w
-        scale_y = internal_res[1] / h
-        return (int(qt_pos.x() * scale_x), int(qt_pos.y() * scale_y))
+        return (int(qt_pos.x() * scale[0]), int(qt_pos.y() * scale[1]))
 
     def _to_widget(self, internal_pos):
         if not self.renderer:
             return (0, 0)
-        internal_w, internal_h = self.renderer.internal_res
-        x = int((internal_pos[0] / max(1, internal_w)) * self.width())
-        y = int((internal_pos[1] / max(1, internal_h)) * self.height())
-        return (x, y)
+        scale_x, scale_y = self._scale_to_widget
+        return (int(internal_pos[0] * scale_x), int(internal_pos[1] * scale_y))
+
+    @staticmethod
+    def _pow2_shift(size):
+        """log2(size) when size is a power of two, else None."""
+        return size.bit_length() - 1 if size & (size - 1) == 0 else None
 
     def _apply_snap(self, pos):
         if not self.snap_enabled or self.grid_size <= 1:
             return (int(pos[0]), int(pos[1]))
+        shift = self._snap_shift
+        x, y = pos
+        if shift is not None and type(x) is int and type(y) is int:
+            # Same result as the round() below, ties to even included: a point exactly
+            # half a cell past a line only rounds up when it is past an odd cell.
+            half = 1 << shift >> 1
+            gx = (x + half - 1 + (x >> shift & 1)) >> shift << shift
+            gy = (y + half - 1 + (y >> shift & 1)) >> shift << shift
+            return (gx, gy)
         gx = int(round(pos[0] / self.grid_size) * self.grid_size)
         gy = int(round(pos[1] / self.grid_size) * self.grid_size)
         return (gx, gy)
@@ -580,30 +788,73 @@ class PygameWidget(QWidget):
             return None
 
     def _add_rect_entity(self, x, y, color):
-        self.world.add_entity(x, y, color)
-        entity = self.world.entities[-1] if self.world.entities else None
-        if entity:
-            entity.sprite_path = None
-        return entity
+        return self._add_rect_entities([x], [y], color)[0]
+
+    def _add_rect_entities(self, xs, ys, color):
+        """Add tool-drawn rect entities in one batch; returns them in draw order."""
+        added = self.world.add_entities(xs, ys, color)
+        if not added:
+            return added
+        self._dirty_rects.append(added[0].rect.unionall([entity.rect for entity in added[1:]]))
+        self._spatial = None
+        return added
 
     def _load_sprite_surface(self, abs_path):
-        if not os.path.exists(abs_path):
+        """Load and prepare a sprite once per file version; entities share the returned surface."""
+        try:
+            # The mtime in the key makes an edited file load fresh
+            key = (abs_path, os.path.getmtime(abs_path))
+        except OSError:
             return None
+        surface = self._sprite_cache.get(key)
+        if surface is not None:
+            self._sprite_cache.move_to_end(key)
+            return surface
         try:
-            loaded = pygame.image.load(abs_path)
-            display_ready = pygame.display.get_init() and pygame.display.get_surface() is not None
-            if not display_ready:
-                return loaded
-            if loaded.get_alpha() is not None:
-                return loaded.convert_alpha()
-            return loaded.convert()
+            return self._cache_sprite(key, pygame.image.load(abs_path))
         except Exception:
             return None
 
+    def _cache_sprite(self, key, loaded):
+        surface = loaded
+        if self.renderer is not None:
+            surface = self.renderer.backend.prepare_surface(loaded)
+        self._sprite_cache[key] = surface
+        if len(self._sprite_cache) > SPRITE_CACHE_SIZE:
+            self._sprite_cache.popitem(last=False)
+        return surface
+
+    def _prefetch_sprites(self, abs_paths):
+        """Decode uncached sprite files on worker threads so a scene load waits for the slowest, not the sum.
+
+        pygame.image.load releases the GIL while decoding; preparing the surface
+        for the backend stays on the GUI thread.
+        """
+        pending = []
+        for abs_path in dict.fromkeys(abs_paths):
+            try:
+                key = (abs_path, os.path.getmtime(abs_path))
+            except OSError:
+                continue
+            if key not in self._sprite_cache:
+                pending.append(key)
+        # More than the cache holds would evict the first ones before they are used
+        pending = pending[:SPRITE_CACHE_SIZE]
+        if len(pending) < 2:
+            return
+        with ThreadPoolExecutor(max_workers=min(SPRITE_DECODE_WORKERS, len(pending))) as pool:
+            futures = [pool.submit(pygame.image.load, abs_path) for abs_path, _ in pending]
+            for key, future in zip(pending, futures):
+                try:
+                    self._cache_sprite(key, future.result())
+                except Exception:
+                    # add_sprite_entity retries the file and falls back to a rect
+                    pass
+
     def _restore_entity(self, saved):
         sprite_path = saved.get("sprite")
         if sprite_path:
-            added = self.add_sprite_entity(saved["x"], saved["y"], sprite_path)
+            added = self.add_sprite_entity(saved["x"], saved["y"], sprite_path, notify=False)
             if added:
                 return
         self.add_rect_entity(
@@ -612,6 +863,7 @@ class PygameWidget(QWidget):
             saved.get("w", 16),
             saved.get("h", 16),
             tuple(saved.get("color", [0, 255, 0])),
+            notify=False,
         )
 
     def _snapshot_entity(self, entity):
@@ -625,49 +877,73 @@ class PygameWidget(QWidget):
         }
 
     def _draw_line_entities(self, start, end):
-        added = []
-        for x, y in ToolManager.line_points(start, end, step=8):
-            entity = self._add_rect_entity(x, y, ToolManager.color_for("Line"))
-            if entity:
-                added.append(entity)
-        return added
+        xs, ys = ToolManager.line_points(start, end, step=8)
+        return self._add_rect_entities(xs, ys, ToolManager.color_for("Line"))
 
     def _draw_rect_entities(self, start, end):
-        added = []
-        for x, y in ToolManager.rect_border_points(start, end, step=8):
-            entity = self._add_rect_entity(x, y, ToolManager.color_for("Rect"))
-            if entity:
-                added.append(entity)
-        return added
+        xs, ys = ToolManager.rect_border_points(start, end, step=8)
+        return self._add_rect_entities(xs, ys, ToolManager.color_for("Rect"))
+
+    @staticmethod
+    def _cell_key(col, row):
+        # Column-major, so the rows of one column form a contiguous key range
+        return (np.int64(col) << 32) + row
+
+    def _spatial_index(self):
+        """Sort entity indices by grid cell; rebuilding is a couple of array ops, so changes just drop it."""
+        if self._spatial is None:
+            cell = self.grid_size * SPATIAL_CELL_STEPS
+            cells = self.world.centers().astype(np.int64) // cell
+            keys = self._cell_key(cells[:, 0], cells[:, 1])
+            order = np.argsort(keys, kind="stable")
+            self._spatial = (cell, keys[order], order)
+        return self._spatial
 
     def _find_nearest_entity(self, x, y, radius=20):
         if not self.world or not self.world.entities:
             return -1
-        nearest = -1
-        best = radius * radius
-        for i, entity in enumerate(self.world.entities):
-            cx, cy = entity.rect.centerx, entity.rect.centery
-            d = (cx - x) * (cx - x) + (cy - y) * (cy - y)
-            if d <= best:
-                best = d
-                nearest = i
-        return nearest
+        cell, keys, order = self._spatial_index()
+        row0, row1 = int((y - radius) // cell), int((y + radius) // cell)
+        spans = []
+        for col in range(int((x - radius) // cell), int((x + radius) // cell) + 1):
+            start = np.searchsorted(keys, self._cell_key(col, row0), side="left")
+            end = np.searchsorted(keys, self._cell_key(col, row1), side="right")
+            spans.append(order[start:end])
+        candidates = np.concatenate(spans)
+        if not len(candidates):
+            return -1
+        world = self.world
+        centers = world.pos[candidates].astype(np.int64) + world.size[candidates] // 2
+        offsets = centers - (x, y)
+        d = (offsets * offsets).sum(axis=1)
+        best = d.min()
+        if best > radius * radius:
+            return -1
+        # Ties go to the topmost (last drawn) entity, as with the old front-to-back scan
+        return int(candidates[d == best].max())
 
     def _remove_nearest_entity(self, x, y, radius=20):
         idx = self._find_nearest_entity(x, y, radius)
         if idx < 0:
             return []
-        entity = self.world.entities.pop(idx)
+        entity = self.world.remove_at(idx)
+        self._spatial = None  # every later index shifted down
+        self._scene_row_changed(idx, removed=True)
+        self._dirty_rects.append(entity.rect.copy())
         self.set_selected_index(-1)
         return [self._snapshot_entity(entity)]
 
-    def _distance_sq(self, a, b):
-        dx = a[0] - b[0]
-        dy = a[1] - b[1]
-        return dx * dx + dy * dy
+    def _to_widget_rect(self, internal_rect):
+        """Widget-space rect covering an internal-res rect, padded for rounding in the scale."""
+        left, top = self._to_widget(internal_rect.topleft)
+        right, bottom = self._to_widget(internal_rect.bottomright)
+        return QRect(QPoint(left - 1, top - 1), QPoint(right + 1, bottom + 1))
 
-    def _notify_world_changed(self):
-        self.needs_redraw = True
+    def _notify_world_changed(self, partial=False):
+        # partial: every changed pixel was already queued in _dirty_rects
+        if not partial:
+            self.needs_redraw = True
+            self._spatial = None
         if self.on_world_changed:
             self.on_world_changed(self.get_scene_data())
 
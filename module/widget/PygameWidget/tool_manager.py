@@ -1,3 +1,32 @@
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the filter then runs as plain Python
+    njit = None
+
+
+def _densify(points, last_x, last_y, has_last, min_dist_sq):
+    keep = np.zeros(len(points), dtype=np.bool_)
+    for i in range(len(points)):
+        x = points[i, 0]
+        y = points[i, 1]
+        if has_last:
+            dx = x - last_x
+            dy = y - last_y
+            if dx * dx + dy * dy < min_dist_sq:
+                continue
+        keep[i] = True
+        last_x = x
+        last_y = y
+        has_last = True
+    return keep
+
+
+if njit is not None:
+    _densify = njit(cache=True)(_densify)
+
+
 class DrawingTool:
     name = "Base"
     color = (255, 255, 255)
@@ -32,30 +61,37 @@ class ToolManager:
 
     @staticmethod
     def line_points(start, end, step=8):
+        """Return (xs, ys) int arrays of points spaced about `step` apart from start to end."""
         x0, y0 = start
         x1, y1 = end
         dx = x1 - x0
         dy = y1 - y0
         steps = max(abs(dx), abs(dy)) // max(1, step) + 1
-        points = []
-        for i in range(steps + 1):
-            t = i / max(steps, 1)
-            x = int(x0 + dx * t)
-            y = int(y0 + dy * t)
-            points.append((x, y))
-        return points
+        t = np.arange(steps + 1) / max(steps, 1)
+        # Same float ops as the old per-point int(x0 + dx * t), so the same truncation
+        return (x0 + dx * t).astype(np.int32), (y0 + dy * t).astype(np.int32)
+
+    @staticmethod
+    def densify_points(points, last=None, min_dist_sq=20):
+        """Keep each (x, y) sample at least sqrt(min_dist_sq) from the previously kept one (or `last`)."""
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        last_x, last_y = last if last else (0, 0)
+        keep = _densify(points, last_x, last_y, last is not None, min_dist_sq)
+        return points[keep, 0], points[keep, 1]
 
     @staticmethod
     def rect_border_points(start, end, step=8):
+        """Return (xs, ys) int arrays: top/bottom pairs across, then left/right pairs down, each point once."""
         left = min(start[0], end[0])
         right = max(start[0], end[0])
         top = min(start[1], end[1])
         bottom = max(start[1], end[1])
-        points = []
-        for x in range(left, right + 1, max(1, step)):
-            points.append((x, top))
-            points.append((x, bottom))
-        for y in range(top, bottom + 1, max(1, step)):
-            points.append((left, y))
-            points.append((right, y))
-        return points
+        across = np.arange(left, right + 1, max(1, step), dtype=np.int32)
+        down = np.arange(top, bottom + 1, max(1, step), dtype=np.int32)
+        xs = np.concatenate((np.repeat(across, 2), np.tile(np.array([left, right], dtype=np.int32), len(down))))
+        ys = np.concatenate((np.tile(np.array([top, bottom], dtype=np.int32), len(across)), np.repeat(down, 2)))
+        # Corners come from both a row and a column, and a flat rect repeats a whole side;
+        # keep the first occurrence of each point so draw order is otherwise unchanged
+        _, first = np.unique(np.stack((xs, ys), axis=1), axis=0, return_index=True)
+        first.sort()
+        return xs[first], ys[first]
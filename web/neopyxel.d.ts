@@ -9,6 +9,13 @@ declare module 'neopyxel' {
     color: [number, number, number];
   }
 
+  export interface EntityBuffers {
+    n: number;
+    pos: Int32Array;    // x, y per entity
+    size: Int32Array;   // width, height per entity
+    color: Uint8Array;  // r, g, b per entity
+  }
+
   export interface EngineConfig {
     backend: 'pygame' | 'opengl' | 'vulkan';
     internalResolution: [number, number];
@@ -27,6 +34,7 @@ declare module 'neopyxel' {
     constructor(canvas: HTMLCanvasElement, config?: Partial<EngineConfig>);
     createEntity(x: number, y: number, color: [number, number, number]): Entity;
     getEntities(): Entity[];
+    getEntityBuffers(): EntityBuffers | null;
     update(dt: number): void;
     render(): void;
     destroy(): void;
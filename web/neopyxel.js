@@ -22,11 +22,43 @@ class NeoPyxelEngine {
     }
   }
 
+  getEntityBuffers() {
+    // Typed-array views over the packed bytes returned by the Python bridge
+    if (!this.pyBridge) {
+      return null;
+    }
+    let data = this.pyBridge.getEntities();
+    if (typeof data.toJs === 'function') {
+      // Pyodide hands back a PyProxy of the Python dict; its keys are not JS properties.
+      // toJs copies the bytes values into fresh Uint8Arrays, so the proxy can go right away.
+      const proxy = data;
+      data = proxy.toJs({ dict_converter: Object.fromEntries });
+      proxy.destroy();
+    }
+    const n = data.n;
+    return {
+      n,
+      pos: new Int32Array(data.pos.buffer, data.pos.byteOffset, n * 2),
+      size: new Int32Array(data.size.buffer, data.size.byteOffset, n * 2),
+      color: new Uint8Array(data.color.buffer, data.color.byteOffset, n * 3),
+    };
+  }
+
   getEntities() {
-    if (this.pyBridge) {
-      return this.pyBridge.getEntities();
+    const buffers = this.getEntityBuffers();
+    if (!buffers) {
+      return [];
+    }
+    const { n, pos, size, color } = buffers;
+    const entities = new Array(n);
+    for (let i = 0; i < n; i++) {
+      entities[i] = {
+        x: pos[i * 2], y: pos[i * 2 + 1],
+        width: size[i * 2], height: size[i * 2 + 1],
+        color: [color[i * 3], color[i * 3 + 1], color[i * 3 + 2]],
+      };
     }
-    return [];
+    return entities;
   }
 
   update(dt) {
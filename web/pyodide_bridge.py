@@ -22,10 +22,13 @@ class PyodideBridge:
         self.world.add_entity(x, y, tuple(color))
 
     def get_entities(self):
-        return [{'x': e.rect.x, 'y': e.rect.y, 'color': e.color} for e in self.world.get_all()]
+        n = len(self.world.entities)
+        # Raw SoA rows: pos/size are int32 pairs, color is uint8 RGB.
+        return {'pos': self.world.pos[:n].tobytes(), 'size': self.world.size[:n].tobytes(),
+                'color': self.world.color[:n].tobytes(), 'n': n}
 
     def update(self, dt):
         self.world.update_all()
         # TODO: อ่าน events จาก JavaScript
-        self.renderer.render(self.world.get_all(), self.lighting, self.ui, self.clock)
+        self.renderer.render(self.world, self.lighting, self.ui, self.clock)
         self.clock.tick(60)
\ No newline at end of file